@@ -1,17 +1,49 @@
 # 📦 Standard Library
 import os
 
-# 🌐 Load environment variables from .env file into the environment
-from dotenv import load_dotenv
-
-# 🔐 Load all environment variables at runtime
-load_dotenv()
+# ⚙️ Settings come from the environment / .env (loaded once by utils.config)
+from utils.config import env_str, env_int, env_float, env_bool
 
 # 🔑 OpenAI API key — used for Whisper and GPT calls
-OPENAI_KEY = os.getenv("OPENAI_KEY")
+OPENAI_KEY = env_str("OPENAI_KEY")
 
 # 🔑 Google Drive API key — optional for certain unauthenticated requests (like file search)
-GDRIVE_API_KEY = os.getenv("GDRIVE_API_KEY")
+GDRIVE_API_KEY = env_str("GDRIVE_API_KEY")
 
 # 📁 Folder ID in Google Drive where processed audio summaries should be uploaded
-AUDIO_DRIVE_FOLDER_ID = os.getenv("AUDIO_DRIVE_FOLDER_ID")
\ No newline at end of file
+AUDIO_DRIVE_FOLDER_ID = env_str("AUDIO_DRIVE_FOLDER_ID")
+
+# 📏 Largest file the Whisper API accepts; bigger recordings are split into chunks
+WHISPER_MAX_BYTES = 25 * 1024 * 1024
+
+# 🧵 Number of audio chunks transcribed in parallel when a recording is split
+TRANSCRIBE_WORKERS = env_int("TRANSCRIBE_WORKERS", 4)
+
+# 🗄️ Persistent transcript store (keyed by Drive file ID, validated by checksum / modifiedTime)
+TRANSCRIPT_CACHE_DIR = env_str("TRANSCRIPT_CACHE_DIR", os.path.join(".cache", "transcripts"))
+TRANSCRIPT_CACHE_MAX_MB = env_int("TRANSCRIPT_CACHE_MAX_MB", 500)
+TRANSCRIPT_CACHE_TTL_DAYS = env_float("TRANSCRIPT_CACHE_TTL_DAYS", 180)
+
+# 🧠 Transcripts above this many tokens are summarized map-reduce style (chunked, in parallel)
+SUMMARY_MAP_REDUCE_TOKENS = env_int("SUMMARY_MAP_REDUCE_TOKENS", 30000)
+
+# ✂️ Target size of each transcript chunk in map-reduce mode, and how many chunks run at once
+SUMMARY_CHUNK_TOKENS = env_int("SUMMARY_CHUNK_TOKENS", 12000)
+SUMMARY_MAP_WORKERS = env_int("SUMMARY_MAP_WORKERS", 4)
+
+# ⬇️ Drive download tuning: bytes requested per Range chunk, consecutive retries, seconds between progress lines
+DOWNLOAD_CHUNK_MB = env_int("DOWNLOAD_CHUNK_MB", 32)
+DOWNLOAD_RETRIES = env_int("DOWNLOAD_RETRIES", 5)
+DOWNLOAD_PROGRESS_SECONDS = env_float("DOWNLOAD_PROGRESS_SECONDS", 5)
+
+# 🚰 Pipe large recordings straight from Drive into ffmpeg's splitter instead of a temp file first
+AUDIO_STREAM_SPLIT = env_bool("AUDIO_STREAM_SPLIT")
+
+# 🗜️ Optional pre-transcode to mono 16 kHz Opus with long silences trimmed, before Whisper
+AUDIO_PREPROCESS = env_bool("AUDIO_PREPROCESS")
+PREPROCESS_SAMPLE_RATE = env_int("PREPROCESS_SAMPLE_RATE", 16000)
+PREPROCESS_BITRATE = env_str("PREPROCESS_BITRATE", "24k")
+
+# 🔇 Silence trimming: quieter than this (dBFS) for longer than this (seconds) is cut down to a short pause
+SILENCE_THRESHOLD_DB = env_float("SILENCE_THRESHOLD_DB", -40)
+SILENCE_MIN_SECONDS = env_float("SILENCE_MIN_SECONDS", 1.5)
@@ -1,145 +1,222 @@
-# Standard Libraries
-import os
 # 📦 Standard Libraries
-import os
 import io
-import pickle
+import os
+import time
+import hashlib
 import tempfile
 
-# 🌐 Third-Party Libraries for Google Auth and Drive
-from dotenv import load_dotenv
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
+# 📡 Shared, cached Drive clients and OAuth credentials
+from utils import drive_client
+from utils.config import env_int
+from utils.docx_engine import DOCX_MIME_TYPE
+from utils.drive_upload import upload_document
+from audio.folder_index import get_folder_index
+from audio.config import DOWNLOAD_CHUNK_MB, DOWNLOAD_RETRIES, DOWNLOAD_PROGRESS_SECONDS
 
-# 🔐 Load environment variables from .env
-load_dotenv()
+# 🎧 File extensions treated as meeting recordings, most preferred first (Zoom's audio-only .m4a wins over
+# anything else in the folder; video containers such as Zoom's .mp4 are not picked up at all)
+AUDIO_EXTENSIONS = (".m4a", ".mp3", ".wav", ".aac", ".ogg", ".flac")
 
-# 🛠 OAuth2 credential and token paths (set via .env)
-CREDENTIALS_PATH = os.getenv("GOOGLE_OAUTH_FILE")
-TOKEN_PATH = os.getenv("GOOGLE_TOKEN_FILE")
+# 📦 How many folders are combined into one files().list query ('a' in parents or 'b' in parents ...)
+AUDIO_QUERY_BATCH_SIZE = env_int("AUDIO_QUERY_BATCH_SIZE", 25)
+
+# 🧾 File fields returned by bulk discovery
+AUDIO_FILE_FIELDS = (
+    "nextPageToken, files(id, name, parents, size, md5Checksum, modifiedTime)"
+)
 
 
 # 🔐 Authenticate with Google Drive using OAuth2 credentials
 def authenticate_with_oauth():
-    SCOPES = ["https://www.googleapis.com/auth/drive.file"]
-    creds = None
+    return drive_client.get_drive_service()
 
-    # ✅ Load cached credentials (token.pickle) if they exist
-    if os.path.exists(TOKEN_PATH):
-        with open(TOKEN_PATH, "rb") as token:
-            creds = pickle.load(token)
 
-    # 🔄 If credentials are missing or expired, refresh or re-authenticate
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        
-        # Launch a browser-based login flow
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-            creds = flow.run_local_server(port=0)
+# 📡 Get Google Drive service, either via OAuth or API key (fallback)
+def get_drive_service(api_key=None):
+    return drive_client.get_drive_service(api_key)
 
-        # 💾 Save the new token to disk
-        with open(TOKEN_PATH, "wb") as token:
-            pickle.dump(creds, token)
 
-    # ✅ Return an authenticated Google Drive service object
-    return build("drive", "v3", credentials=creds)
+# 🔁 Drive statuses worth retrying (rate limits and transient server errors)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
 
 
-# 📡 Get Google Drive service, either via OAuth or API key (fallback)
-def get_drive_service(api_key=None):
-    if api_key:
-        print("🔐 Using API Key authentication")
-        return build("drive", "v3", developerKey=api_key)
-    
-    else:
-        print("🔐 Using OAuth authentication")
-        return authenticate_with_oauth()
+# 🧮 Wraps the download target: hashes and counts bytes as they are written
+class _HashingWriter:
 
+    def __init__(self, sink):
+        self._sink = sink
+        self.md5 = hashlib.md5()
+        self.bytes_written = 0
+
+    def write(self, data):
+        # A failing sink (disk full, ffmpeg exited) must not look like a dropped connection:
+        # the downloader has already advanced its offset, so a retry would skip these bytes
+        try:
+            self._sink.write(data)
+        except OSError as e:
+            raise RuntimeError(f"Writing downloaded audio failed: {e}") from e
+
+        self.md5.update(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+
+# 🔁 Connection drops, timeouts and Drive 429/5xx are retried; everything else fails the download
+def _is_retryable(error):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUSES
+    return isinstance(error, (OSError, httplib2.HttpLib2Error))
+
+
+# 🚰 Streams a Drive file into any writable object in large Range chunks, resuming from the last byte on failure
+def stream_audio_from_drive(file_id, sink, api_key=None, expected_md5=None, chunk_size=None):
+    from googleapiclient.http import MediaIoBaseDownload
 
-# ⬇️ Download an audio file from Google Drive and store it temporarily
-def download_audio_from_drive(file_id, api_key=None):
     service = get_drive_service(api_key)
     request = service.files().get_media(fileId=file_id)
-    
-    # Create a temporary local .m4a file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".m4a")
-    downloader = MediaIoBaseDownload(temp_file, request)
+
+    writer = _HashingWriter(sink)
+    downloader = MediaIoBaseDownload(writer, request, chunksize=chunk_size or DOWNLOAD_CHUNK_MB * 1024 * 1024)
+
+    attempts = 0
+    last_report = 0.0
     done = False
 
-    # Stream the download in chunks
     while not done:
-        status, done = downloader.next_chunk()
-        print(f"Downloading audio: {int(status.progress() * 100)}%")
+        # 📡 Each call requests "Range: bytes=<offset>-..."; the offset only advances after a chunk is written,
+        # so a retry picks up exactly where the dropped connection stopped
+        try:
+            status, done = downloader.next_chunk()
+        except Exception as e:
+            if not _is_retryable(e) or attempts >= DOWNLOAD_RETRIES:
+                raise
+
+            attempts += 1
+            delay = min(30, 2 ** attempts)
+            print(
+                f"⚠️ Download interrupted at {round(writer.bytes_written / 1024 / 1024, 1)}MB ({e}); "
+                f"resuming in {delay}s (attempt {attempts}/{DOWNLOAD_RETRIES})"
+            )
+            time.sleep(delay)
+            continue
+
+        attempts = 0
+
+        # ⏱️ Progress is reported at most every DOWNLOAD_PROGRESS_SECONDS, plus once at the end
+        now = time.monotonic()
+        if done or now - last_report >= DOWNLOAD_PROGRESS_SECONDS:
+            last_report = now
+            print(f"Downloading audio: {int(status.progress() * 100)}% ({round(writer.bytes_written / 1024 / 1024, 1)}MB)")
+
+    # 🔒 Drive reports an MD5 for binary files; a mismatch means the bytes were corrupted in transit
+    if expected_md5 and writer.md5.hexdigest() != expected_md5:
+        raise ValueError(f"Checksum mismatch for {file_id}: expected {expected_md5}, got {writer.md5.hexdigest()}")
+
+    return writer.bytes_written
+
+
+# ⬇️ Download an audio file from Google Drive and store it temporarily
+def download_audio_from_drive(file_id, api_key=None, suffix=".m4a", expected_md5=None):
+
+    # Create a temporary local file with the recording's extension (.m4a by default)
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+
+    try:
+        with temp_file:
+            stream_audio_from_drive(file_id, temp_file, api_key=api_key, expected_md5=expected_md5)
+    except Exception:
+        os.remove(temp_file.name)
+        raise
 
-    temp_file.close()
     return temp_file.name
 
 
-# 📤 Upload a DOCX file (from memory) to Google Drive
-def upload_file_to_drive_in_memory(file_data, folder_id, api_key=None, final_name="Zoom Call Notes.docx"):
+# 📤 Upload a DOCX file (from memory) to Google Drive; a rendered buffer is streamed as-is, raw bytes are wrapped.
+# `key` identifies the document across runs (e.g. the row), so a re-run updates it in place or skips it if unchanged
+def upload_file_to_drive_in_memory(file_data, folder_id, api_key=None, final_name="Zoom Call Notes.docx", key=None):
+    file_stream = file_data if hasattr(file_data, "read") else io.BytesIO(file_data)
+    return upload_document(file_stream, folder_id, final_name, mime_type=DOCX_MIME_TYPE, key=key, api_key=api_key)
+
+
+# 🏆 Tie-breaks between recordings with the same extension (ties broken by ID so the choice is deterministic)
+AUDIO_PREFERENCES = {
+    "newest": lambda file: (file.get("modifiedTime") or "", file["size"], file["id"]),
+    "largest": lambda file: (file["size"], file.get("modifiedTime") or "", file["id"]),
+}
+
+
+# 🔍 Resolve the audio file of many folders at once with combined, paginated queries
+def find_audio_files_in_folders(folder_ids, extensions=AUDIO_EXTENSIONS, prefer="newest", api_key=None, batch_size=None):
     service = get_drive_service(api_key)
-    
-    # Prepare file metadata (name + destination folder)
-    file_metadata = {"name": final_name, "parents": [folder_id]}
-    file_stream = io.BytesIO(file_data)
-
-    # Define the media type for Word documents
-    media = MediaIoBaseUpload(
-        file_stream,
-        mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        resumable=True,
-    )
-
-    # Upload the file and get its ID
-    file = (
-        service.files()
-        .create(body=file_metadata, media_body=media, fields="id")
-        .execute()
-    )
-
-    print(f"📤 File uploaded: {file.get('id')}")
-    return file.get("id")
-
-
-# 🔍 Search for the first audio file in a specific Drive folder
+    extensions = tuple(extension.lower() for extension in extensions)
+    preference = AUDIO_PREFERENCES[prefer]
+    batch_size = max(1, batch_size or AUDIO_QUERY_BATCH_SIZE)
+
+    unique_ids = list(dict.fromkeys(folder_id for folder_id in folder_ids if folder_id))
+    candidates = {folder_id: [] for folder_id in unique_ids}
+
+    for start in range(0, len(unique_ids), batch_size):
+        batch = unique_ids[start : start + batch_size]
+        parents = " or ".join(f"'{folder_id}' in parents" for folder_id in batch)
+        query = f"({parents}) and trashed = false and mimeType != 'application/vnd.google-apps.folder'"
+
+        # 📄 Follow nextPageToken so large folders are fully covered
+        page_token = None
+        while True:
+            response = service.files().list(
+                q=query,
+                fields=AUDIO_FILE_FIELDS,
+                pageSize=1000,
+                pageToken=page_token,
+            ).execute()
+
+            for file in response.get("files", []):
+                if not file["name"].lower().endswith(extensions):
+                    continue
+
+                file["size"] = int(file.get("size") or 0)
+
+                for parent in file.get("parents", []):
+                    if parent in candidates:
+                        candidates[parent].append(file)
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+    # 🥇 Earlier extensions in the list win first; newest/largest only decides between files of the same type
+    def rank(file):
+        name = file["name"].lower()
+        return (-next(i for i, extension in enumerate(extensions) if name.endswith(extension)), preference(file))
+
+    return {
+        folder_id: max(files, key=rank) if files else None
+        for folder_id, files in candidates.items()
+    }
+
+
+# 🔍 Search for the audio file in a specific Drive folder
 def find_audio_file_in_folder(folder_id, extension=".m4a", api_key=None):
-    service = get_drive_service(api_key)
-    
-    # Query all files in the target folder
-    query = f"'{folder_id}' in parents"
-    results = service.files().list(q=query, fields="files(id, name)").execute()
-    files = results.get("files", [])
-
-    # Match file by extension
-    for file in files:
-        if file["name"].lower().endswith(extension):
-            print(f"🎯 Found audio file: {file['name']}")
-            return file["id"]
-
-    print("⚠️ No .m4a file found in folder.")
+    file = find_audio_files_in_folders([folder_id], extensions=(extension,), api_key=api_key)[folder_id]
+
+    if file:
+        print(f"🎯 Found audio file: {file['name']}")
+        return file["id"]
+
+    print(f"⚠️ No {extension} file found in folder.")
     return None
 
 
-# 🔍 Try to locate a folder based on company name keywords under a parent folder
+# 🔍 Locate the best-matching folder for a company name under a parent folder (indexed once per run)
 def find_folder_id_by_partial_name(company_name, parent_folder_id, api_key=None):
-    service = get_drive_service(api_key)
-    
-    # Search for subfolders under the parent folder
-    query = f"mimeType='application/vnd.google-apps.folder' and '{parent_folder_id}' in parents"
-    response = service.files().list(q=query, fields="files(id, name)").execute()
-    folders = response.get("files", [])
-    company_keywords = company_name.lower().split()
-
-    # Match any folder whose name contains a keyword from the company name
-    for folder in folders:
-        folder_name = folder["name"].lower()
-        if any(keyword in folder_name for keyword in company_keywords):
-            print(f"📁 Matched folder: {folder['name']}")
-            return folder["id"]
+    folder = get_folder_index(parent_folder_id, api_key=api_key).best_match(company_name)
+
+    if folder:
+        print(f"📁 Matched folder: {folder['name']}")
+        return folder["id"]
 
     print(f"❌ No folder matched any part of: {company_name}")
-    return None
\ No newline at end of file
+    return None
@@ -0,0 +1,198 @@
+# 📦 Standard Libraries
+import re
+import math
+import time
+import threading
+from collections import defaultdict
+
+from utils.config import env_float
+from utils.drive_client import get_drive_service
+
+# 📁 Drive MIME type of folders
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+# ⏱️ How often (seconds) the index checks Drive for new or renamed folders
+FOLDER_INDEX_REFRESH_SECONDS = env_float("FOLDER_INDEX_REFRESH_SECONDS", 300)
+
+# 🏗️ How often (seconds) the index is rebuilt from a full listing; the incremental refresh only sees new and
+# changed folders, so deleted, trashed or moved folders drop out of a long-running (watch mode) index here
+FOLDER_INDEX_REBUILD_SECONDS = env_float("FOLDER_INDEX_REBUILD_SECONDS", 3600)
+
+# ⏱️ A lookup miss re-checks Drive at most this often (seconds), in case the folder was just created
+FOLDER_INDEX_MISS_REFRESH_SECONDS = 30
+
+# 🎯 Minimum score (0–1) a folder needs to count as a match
+FOLDER_MATCH_MIN_SCORE = env_float("FOLDER_MATCH_MIN_SCORE", 0.3)
+
+# 🚫 Words that say nothing about which company a folder belongs to
+STOPWORDS = {
+    "the", "and", "of", "for", "a", "an", "co", "company", "inc", "llc", "llp",
+    "ltd", "limited", "pvt", "private", "corp", "corporation", "group",
+}
+
+# ➗ Weight of a prefix match ("acme" → "acmecorp") relative to an exact token match
+PREFIX_MATCH_WEIGHT = 0.5
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+# 🔤 Splits a name into lowercase alphanumeric tokens, dropping stopwords where possible
+def tokenize(name):
+    tokens = re.findall(r"[a-z0-9]+", name.lower())
+    meaningful = [token for token in tokens if token not in STOPWORDS]
+    return meaningful or tokens
+
+
+# 🗂️ Token-level inverted index over the subfolders of one Drive parent folder
+class FolderIndex:
+
+    def __init__(self, parent_folder_id, api_key=None):
+        self.parent_folder_id = parent_folder_id
+        self.api_key = api_key
+        self.folders = {}                       # folder_id -> {"id", "name", "modifiedTime", "tokens"}
+        self.postings = defaultdict(set)        # token -> {folder_id}
+        self.last_modified = None               # Newest modifiedTime seen (RFC 3339, sortable as text)
+        self.last_refresh = 0.0
+        self.last_build = 0.0
+        self._lock = threading.RLock()
+
+    # 📄 Lists subfolders with full pagination, optionally only those modified after a timestamp
+    def _list_folders(self, modified_after=None):
+        service = get_drive_service(self.api_key)
+        query = f"mimeType='{FOLDER_MIME_TYPE}' and '{self.parent_folder_id}' in parents and trashed = false"
+        if modified_after:
+            query += f" and modifiedTime > '{modified_after}'"
+
+        folders = []
+        page_token = None
+        while True:
+            response = service.files().list(
+                q=query,
+                fields="nextPageToken, files(id, name, modifiedTime)",
+                pageSize=1000,
+                pageToken=page_token,
+            ).execute()
+            folders.extend(response.get("files", []))
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return folders
+
+    # ➕ Adds or re-indexes a folder (a renamed folder replaces its old tokens)
+    def _add(self, folder):
+        old = self.folders.get(folder["id"])
+        if old:
+            for token in old["tokens"]:
+                self.postings[token].discard(folder["id"])
+                if not self.postings[token]:
+                    del self.postings[token]
+
+        tokens = set(tokenize(folder["name"]))
+        self.folders[folder["id"]] = {**folder, "tokens": tokens}
+        for token in tokens:
+            self.postings[token].add(folder["id"])
+
+        modified = folder.get("modifiedTime")
+        if modified and (not self.last_modified or modified > self.last_modified):
+            self.last_modified = modified
+
+    # 🏗️ Builds the index from one full (paginated) listing
+    def build(self):
+        with self._lock:
+            self.folders.clear()
+            self.postings.clear()
+            self.last_modified = None
+
+            for folder in self._list_folders():
+                self._add(folder)
+
+            self.last_refresh = self.last_build = time.time()
+            print(f"🗂️ Indexed {len(self.folders)} folder(s) under {self.parent_folder_id}")
+
+    # 🔄 Picks up folders created or renamed since the newest modifiedTime already indexed
+    # (a full rebuild when the index is empty or older than FOLDER_INDEX_REBUILD_SECONDS)
+    def refresh(self):
+        with self._lock:
+            if not self.folders or time.time() - self.last_build > FOLDER_INDEX_REBUILD_SECONDS:
+                self.build()
+                return
+
+            changed = self._list_folders(modified_after=self.last_modified)
+            for folder in changed:
+                self._add(folder)
+
+            self.last_refresh = time.time()
+            if changed:
+                print(f"🔄 Folder index refreshed: {len(changed)} new or changed folder(s)")
+
+    # 🎯 Returns (score, folder) pairs for a company name, best first
+    def search(self, company_name, limit=5):
+        query_tokens = set(tokenize(company_name))
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            total_folders = max(1, len(self.folders))
+
+            # 📈 Rarer tokens count more (inverse document frequency)
+            def idf(token):
+                return math.log(1 + total_folders / max(1, len(self.postings.get(token, ()))))
+
+            query_weight = sum(idf(token) for token in query_tokens)
+            scores = defaultdict(float)
+
+            for token in query_tokens:
+                weight = idf(token)
+
+                # Exact token match
+                for folder_id in self.postings.get(token, ()):
+                    scores[folder_id] += weight
+
+                # Prefix match keeps the old substring behaviour for glued names ("acme" → "acmecorp")
+                if len(token) >= 3:
+                    for folder_token, folder_ids in self.postings.items():
+                        if folder_token != token and folder_token.startswith(token):
+                            for folder_id in folder_ids:
+                                scores[folder_id] += weight * PREFIX_MATCH_WEIGHT
+
+            results = []
+            for folder_id, score in scores.items():
+                folder = self.folders[folder_id]
+
+                # 🧮 Coverage of the query, nudged towards folders without many unrelated words
+                coverage = min(1.0, score / query_weight)
+                precision = len(query_tokens & folder["tokens"]) / max(1, len(folder["tokens"]))
+                results.append((round(0.9 * coverage + 0.1 * precision, 6), folder))
+
+        # 🔢 Deterministic order: best score, then name, then ID
+        results.sort(key=lambda item: (-item[0], item[1]["name"].lower(), item[1]["id"]))
+        return results[:limit]
+
+    # 🏆 Returns the best-scoring folder above the threshold, refreshing first if the index is stale
+    def best_match(self, company_name, min_score=FOLDER_MATCH_MIN_SCORE):
+        if not self.folders or time.time() - self.last_refresh > FOLDER_INDEX_REFRESH_SECONDS:
+            self.refresh()
+
+        results = self.search(company_name, limit=1)
+
+        # 🆕 A miss may be a folder created moments ago; check Drive once more
+        missed = not results or results[0][0] < min_score
+        if missed and time.time() - self.last_refresh > FOLDER_INDEX_MISS_REFRESH_SECONDS:
+            self.refresh()
+            results = self.search(company_name, limit=1)
+
+        if results and results[0][0] >= min_score:
+            return results[0][1]
+
+        return None
+
+
+# 🗂️ Returns the shared index for a parent folder (built on first use, reused for the whole run)
+def get_folder_index(parent_folder_id, api_key=None):
+    key = (parent_folder_id, api_key)
+
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = FolderIndex(parent_folder_id, api_key=api_key)
+        return _indexes[key]
@@ -0,0 +1,110 @@
+# 📦 Standard Libraries
+import os
+import tempfile
+import subprocess
+
+from audio.config import (
+    PREPROCESS_SAMPLE_RATE,
+    PREPROCESS_BITRATE,
+    SILENCE_THRESHOLD_DB,
+    SILENCE_MIN_SECONDS,
+)
+from audio.utils import probe_audio
+
+# 🔇 Seconds of each trimmed silence that are kept, so speakers' turns stay separated
+SILENCE_KEEP_SECONDS = 0.5
+
+
+# 🛠️ ffmpeg command that downmixes, resamples, trims long silences and encodes speech-tuned Opus
+def _transcode_command(source, output_path):
+    # silenceremove measures RMS energy per window: a simple energy-based voice activity detector
+    silence_filter = (
+        "silenceremove="
+        "stop_periods=-1:"
+        f"stop_duration={SILENCE_MIN_SECONDS}:"
+        f"stop_threshold={SILENCE_THRESHOLD_DB}dB:"
+        f"stop_silence={SILENCE_KEEP_SECONDS}:"
+        "detection=rms"
+    )
+    return [
+        "ffmpeg", "-v", "error", "-y",
+        "-i", source,
+        "-vn",                                  # Drop video / cover art
+        "-ac", "1",                             # Mono
+        "-ar", str(PREPROCESS_SAMPLE_RATE),     # 16 kHz is what Whisper resamples to anyway
+        "-af", silence_filter,
+        "-c:a", "libopus",
+        "-b:a", PREPROCESS_BITRATE,
+        "-application", "voip",                 # Opus mode tuned for speech
+        output_path,
+    ]
+
+
+# 📉 Logs what preprocessing saved: bytes to upload and, when the original length is known, seconds to transcribe
+def _report_savings(original_bytes, original_seconds, output_path):
+    info = probe_audio(output_path)
+    saved_bytes = max(0, original_bytes - info["size"])
+    saved_seconds = max(0, original_seconds - info["duration"]) if original_seconds else None
+
+    length = f"{round(info['duration'] / 60, 1)} min"
+    if saved_seconds is not None:
+        length = f"{round(original_seconds / 60, 1)} → {length} (trimmed {round(saved_seconds)}s of silence)"
+
+    print(
+        f"🗜️ Preprocessed audio: {round(original_bytes / 1024 / 1024, 2)}MB → {round(info['size'] / 1024 / 1024, 2)}MB "
+        f"(saved {round(saved_bytes / 1024 / 1024, 2)}MB), {length}"
+    )
+    return {"bytes_saved": saved_bytes, "seconds_saved": saved_seconds}
+
+
+# 🗜️ Re-encodes a recording into a compact speech file; returns the new path, or the original if ffmpeg fails
+def preprocess_audio(audio_path):
+    output_path = os.path.splitext(audio_path)[0] + "_speech.ogg"
+
+    try:
+        original = probe_audio(audio_path)
+        subprocess.run(_transcode_command(audio_path, output_path), capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️ Audio preprocessing failed, transcribing the original: {e}")
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        return audio_path
+
+    _report_savings(original["size"], original["duration"], output_path)
+    return output_path
+
+
+# 🚰 Transcodes a recording while it downloads: write_audio(sink) feeds bytes into ffmpeg's stdin, no temp file.
+# The original length is optional: Drive only reports durations for video files.
+def preprocess_audio_stream(write_audio, output_prefix, original_bytes=0, original_seconds=None):
+    output_path = f"{output_prefix}_speech.ogg"
+
+    # ffmpeg's log goes to a file so a chatty stderr can never fill a pipe and block the writer
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(
+            _transcode_command("pipe:0", output_path),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+        )
+
+        try:
+            write_audio(process.stdin)
+            process.stdin.close()
+            returncode = process.wait()
+
+        except Exception:
+            process.kill()
+            process.wait()
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+        if returncode != 0:
+            log.seek(0)
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise subprocess.CalledProcessError(returncode, "ffmpeg", stderr=log.read())
+
+    _report_savings(original_bytes, original_seconds, output_path)
+    return output_path
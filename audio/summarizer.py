@@ -1,12 +1,20 @@
-import openai
-from audio.utils import extract_json_block
+# 📦 Standard Libraries
+import re
+import json
+import asyncio
 
+from audio.config import SUMMARY_MAP_REDUCE_TOKENS, SUMMARY_CHUNK_TOKENS, SUMMARY_MAP_WORKERS
+from utils.cache import get_summary_cache, make_cache_key
+from utils.tokens import count_tokens, split_by_tokens
+from utils.structured_output import KeyedListSchema, complete_structured, acomplete_structured
 
-# 🧠 Generates a structured summary from raw meeting transcript text using OpenAI GPT
-def generate_summary(transcript_text):
-    
-    # 📝 Prompt instructing GPT to act as a business analyst and return JSON
-    system_prompt = """
+# 🤖 Model settings (also part of the summary cache key)
+MODEL = "gpt-4.1-2025-04-14"
+TEMPERATURE = 0.3
+
+
+# 📝 Prompt instructing GPT to act as a business analyst and return JSON
+SYSTEM_PROMPT = """
 You are an expert business analyst. You will be given a raw transcript from a client-agency meeting.
 
 Your task is to extract a comprehensive and structured summary in JSON format using the schema below.
@@ -34,15 +42,147 @@ Schema:
   }
 }
 """
-    # 🧾 Make a GPT API call using the transcript as input
-    chat_response = openai.ChatCompletion.create(
-        model="gpt-4.1-2025-04-14",
-        messages=[
-            {"role": "system", "content": system_prompt},   # Provides instructions to GPT
-            {"role": "user", "content": transcript_text},   # Supplies the raw transcript
-        ],
-        temperature=0.3,  # Low temperature for deterministic, consistent output
+
+
+# 🧩 Added to the system prompt for each chunk in map-reduce mode
+MAP_PROMPT_SUFFIX = """
+The transcript is long, so you are given one part of it. This is part {index} of {total}.
+Summarize only what is discussed in this part, using the same schema. Use empty lists for sections this part does not cover.
+"""
+
+# 🔗 Prompt for the reduce pass that merges the partial summaries
+REDUCE_PROMPT = """
+You are an expert business analyst. You will be given a JSON summary that was assembled from several parts of one long client-agency meeting.
+
+Merge it into a single, clean summary using exactly the same schema:
+- Combine points that describe the same thing into one bullet; keep every distinct point.
+- Keep the Minutes of the Meeting in the order the topics were discussed.
+- Keep responsible parties, deadlines, budgets and KPIs exactly as stated.
+
+Return **only valid JSON** with no extra text, markdown, or explanation.
+"""
+
+# 🗝️ Keys of the summary schema
+LIST_KEYS = ("mom", "todo_list")
+ACTION_PLAN_KEYS = (
+    "decision_made",
+    "key_services_to_promote",
+    "target_geography",
+    "budget_and_timeline",
+    "lead_management_strategy",
+    "next_steps_and_ownership",
+)
+
+# ✅ Every section must be a list of bullet strings (empty lists are fine, e.g. for a chunk that skips a topic)
+SUMMARY_SCHEMA = KeyedListSchema("Meeting summary", LIST_KEYS + tuple(f"action_plan.{key}" for key in ACTION_PLAN_KEYS))
+
+
+# 💬 Chat messages for one summary request
+def _summary_messages(system_prompt, user_content):
+    return [
+        {"role": "system", "content": system_prompt},   # Provides instructions to GPT
+        {"role": "user", "content": user_content},      # Supplies the transcript (or partial summaries)
+    ]
+
+
+# 🤖 Sends one GPT request and returns the schema-validated summary (only invalid sections are re-asked)
+def _request_summary(system_prompt, user_content):
+    return complete_structured(
+        SUMMARY_SCHEMA,
+        _summary_messages(system_prompt, user_content),
+        model=MODEL,
+        temperature=TEMPERATURE,  # Low temperature for deterministic, consistent output
     )
 
-    # 🔍 Extract the JSON content from the GPT response
-    return extract_json_block(chat_response.choices[0].message.content)
\ No newline at end of file
+
+# 🤖 Async twin of _request_summary, used to fan out map-reduce chunks on one event loop
+async def _arequest_summary(system_prompt, user_content):
+    return await acomplete_structured(
+        SUMMARY_SCHEMA,
+        _summary_messages(system_prompt, user_content),
+        model=MODEL,
+        temperature=TEMPERATURE,
+    )
+
+
+# 🧹 Normalizes a bullet for duplicate detection (case, punctuation and spacing are ignored)
+def _dedupe_key(item):
+    return re.sub(r"[^a-z0-9]+", " ", str(item).lower()).strip()
+
+
+# ➕ Appends items to a list, skipping ones already present
+def _extend_unique(target, seen, items):
+    for item in items or []:
+        key = _dedupe_key(item)
+        if key and key not in seen:
+            seen.add(key)
+            target.append(str(item).strip())
+
+
+# 🔗 Merges partial summaries section by section, dropping duplicate bullets
+def merge_partial_summaries(partials):
+    merged = {key: [] for key in LIST_KEYS}
+    merged["action_plan"] = {key: [] for key in ACTION_PLAN_KEYS}
+    seen = {key: set() for key in LIST_KEYS + ACTION_PLAN_KEYS}
+
+    for partial in partials:
+        for key in LIST_KEYS:
+            _extend_unique(merged[key], seen[key], partial.get(key))
+
+        action_plan = partial.get("action_plan") or {}
+        for key in ACTION_PLAN_KEYS:
+            _extend_unique(merged["action_plan"][key], seen[key], action_plan.get(key))
+
+    return merged
+
+
+# 🗺️ Map: summarizes transcript chunks in parallel; Reduce: merges and consolidates the results
+def _map_reduce_summary(transcript_text):
+    chunks = split_by_tokens(transcript_text, SUMMARY_CHUNK_TOKENS)
+    total = len(chunks)
+    print(f"🗺️ Long transcript — summarizing {total} chunk(s) in parallel (map-reduce mode).")
+
+    async def summarize_chunks():
+        semaphore = asyncio.Semaphore(max(1, SUMMARY_MAP_WORKERS))
+
+        async def summarize_chunk(index, chunk):
+            async with semaphore:
+                prompt = SYSTEM_PROMPT + MAP_PROMPT_SUFFIX.format(index=index, total=total)
+                return await _arequest_summary(prompt, chunk)
+
+        # gather() returns results in chunk order
+        return await asyncio.gather(*(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks, start=1)))
+
+    partials = asyncio.run(summarize_chunks())
+
+    merged = merge_partial_summaries(partials)
+
+    # 🔗 Reduce pass: let GPT consolidate overlapping points; the local merge is the fallback
+    try:
+        reduced = _request_summary(REDUCE_PROMPT, json.dumps(merged, ensure_ascii=False))
+        return merge_partial_summaries([reduced])
+
+    except Exception as e:
+        print(f"⚠️ Reduce pass failed, using locally merged summary: {e}")
+        return merged
+
+
+# 🧠 Generates a structured summary from raw meeting transcript text using OpenAI GPT
+def generate_summary(transcript_text):
+
+    # ♻️ Reuse a previous summary of the exact same transcript, prompt and model settings
+    cache = get_summary_cache()
+    cache_key = make_cache_key("audio-summary", SYSTEM_PROMPT, MODEL, TEMPERATURE, transcript_text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print("♻️ Meeting summary served from cache.")
+        return cached
+
+    # 🧾 Long meetings are chunked and summarized map-reduce style; short ones in a single request
+    if count_tokens(transcript_text) > SUMMARY_MAP_REDUCE_TOKENS:
+        summary = _map_reduce_summary(transcript_text)
+    else:
+        summary = _request_summary(SYSTEM_PROMPT, transcript_text)
+
+    cache.set(cache_key, summary)
+    return summary
@@ -0,0 +1,68 @@
+# 📦 Standard Libraries
+import threading
+
+from audio.config import TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB, TRANSCRIPT_CACHE_TTL_DAYS
+from utils.cache import DiskCache, make_cache_key
+
+# 🎙️ Settings that change the transcript text; a different value means a different entry
+TRANSCRIPTION_SETTINGS = {"model": "whisper-1", "task": "translate"}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# 🗄️ Returns the process-wide transcript store
+def get_transcript_store():
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = DiskCache(
+                TRANSCRIPT_CACHE_DIR,
+                max_bytes=TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+                ttl_seconds=TRANSCRIPT_CACHE_TTL_DAYS * 24 * 3600,
+                name="transcripts",
+            )
+        return _store
+
+
+# 🔑 One entry per Drive file, so a re-uploaded recording replaces its old transcript
+def _entry_key(file_id):
+    return make_cache_key("transcript", file_id, TRANSCRIPTION_SETTINGS)
+
+
+# 🏷️ Content version of a Drive file: md5Checksum when Drive provides one, otherwise modifiedTime
+def file_version(metadata):
+    return metadata.get("md5Checksum") or metadata.get("modifiedTime") or ""
+
+
+# 🔍 Returns the stored transcript if the Drive file is unchanged since it was transcribed
+def get_cached_transcript(file_id, metadata):
+    version = file_version(metadata)
+    if not version:
+        return None
+
+    entry = get_transcript_store().get(_entry_key(file_id))
+    if entry and entry.get("version") == version:
+        return entry.get("transcript")
+
+    return None
+
+
+# 💾 Saves a transcript together with the file version it was produced from
+def store_transcript(file_id, metadata, transcript):
+    version = file_version(metadata)
+    if not version:
+        return
+
+    get_transcript_store().set(_entry_key(file_id), {
+        "file_id": file_id,
+        "name": metadata.get("name"),
+        "version": version,
+        "transcript": transcript,
+    })
+
+
+# 🗑️ Forgets the transcript of a single Drive file (forces re-download and re-transcription)
+def invalidate_transcript(file_id):
+    return get_transcript_store().invalidate(_entry_key(file_id))
@@ -1,23 +1,56 @@
-import openai
-from audio.config import OPENAI_KEY
+# 📦 Standard Libraries
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-# 🔐 Set the OpenAI API key (loaded from .env via config)
-openai.api_key = OPENAI_KEY
+from audio.config import TRANSCRIBE_WORKERS
+from utils.openai_gateway import get_gateway
 
 
 # 🎧 Transcribes an audio file to text using OpenAI Whisper API
 def transcribe_audio(audio_path):
     print("🎙️ Transcribing with OpenAI Whisper API...")
     
-    # Open the audio file in binary mode
-    with open(audio_path, "rb") as audio_file:
-        # 🔁 Send file to OpenAI Whisper for transcription (English translation)
-        response = openai.Audio.transcribe(
-            model="whisper-1",       # Use Whisper model
-            file=audio_file,         # Pass the audio stream
-            response_format="text",  # Return plain text
-            task="translate"         # Auto-translate non-English audio to English
-        )
-        
-        # 🧾 Return cleaned transcript
-        return response.strip()
\ No newline at end of file
+    # 🔁 Send file to OpenAI Whisper for transcription (English translation); the gateway handles rate limits
+    response = get_gateway().transcribe(
+        audio_path,
+        model="whisper-1",       # Use Whisper model
+        response_format="text",  # Return plain text
+        task="translate"         # Auto-translate non-English audio to English
+    )
+
+    # 🧾 Return cleaned transcript
+    return response.strip()
+
+
+# 📝 Transcribes one chunk (the gateway retries throttling and transient errors); the chunk file is always removed
+def _transcribe_chunk(index, total, chunk_path):
+    try:
+        print(f"📝 Transcribing chunk {index}/{total}: {os.path.basename(chunk_path)}")
+        return transcribe_audio(chunk_path)
+
+    finally:
+        if os.path.exists(chunk_path):
+            os.remove(chunk_path)
+
+
+# 🧩 Transcribes split audio chunks concurrently and joins the transcripts in chunk order
+def transcribe_chunks(chunk_paths, max_workers=None):
+    max_workers = max(1, max_workers or TRANSCRIBE_WORKERS)
+    total = len(chunk_paths)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, total or 1)) as pool:
+        futures = [
+            pool.submit(_transcribe_chunk, i, total, chunk_path)
+            for i, chunk_path in enumerate(chunk_paths, start=1)
+        ]
+
+        # 📚 Results are collected in submission order, so the transcript stays in sequence
+        try:
+            return "\n".join(future.result() for future in futures)
+
+        # ❌ Stop queued chunks early and remove the files of chunks that will never run
+        except Exception:
+            for future, chunk_path in zip(futures, chunk_paths):
+                if future.cancel() and os.path.exists(chunk_path):
+                    os.remove(chunk_path)
+            raise
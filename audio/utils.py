@@ -1,75 +1,166 @@
-import re
 import json
-from pydub import AudioSegment
 import os
+import tempfile
+import subprocess
 
 
-# 🔍 Extracts the first JSON block from a string (e.g. GPT output)
-def extract_json_block(text):
-    
-    # Look for a block starting and ending with curly braces
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group())    # Attempt to parse the matched block as JSON
-        except json.JSONDecodeError as e:
-            print("❌ JSON decoding failed:", e)
-            print("OpenAI response:", text)
-            raise
-    
-    else:
-        print("❌ No JSON found in OpenAI response.")
-        print("Raw output:", text)
-        raise ValueError("Response did not contain valid JSON.")
+# 📏 Fraction of the size limit a chunk is planned for (headroom for VBR peaks and container overhead)
+CHUNK_SIZE_HEADROOM = 0.9
+
+
+# 🔎 Reads duration (seconds), bitrate (bits/s) and size (bytes) from the container metadata via ffprobe
+def probe_audio(audio_path):
+    command = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration,bit_rate,size",
+        "-of", "json",
+        audio_path,
+    ]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    info = json.loads(output).get("format", {})
+
+    duration = float(info.get("duration") or 0)
+    size = int(info.get("size") or os.path.getsize(audio_path))
+    bit_rate = int(info.get("bit_rate") or 0)
+
+    # Some containers omit the bitrate; derive it from size and duration instead
+    if not bit_rate and duration:
+        bit_rate = int(size * 8 / duration)
+
+    return {"duration": duration, "bit_rate": bit_rate, "size": size}
+
+
+# 🚰 Containers ffmpeg can demux from a pipe (MP4/M4A keep their index at the end and need a seekable file)
+STREAMABLE_EXTENSIONS = (".mp3", ".wav", ".aac", ".ogg", ".flac")
+
+# 📈 Highest bitrate (bits/s) expected per streamable format. A streamed recording cannot be probed up front and
+# Drive reports no duration for audio files, so chunks are sized for the worst case. Higher-resolution files are
+# caught by _enforce_chunk_size.
+STREAM_BIT_RATES = {
+    ".mp3": 320_000,        # MPEG-1 Layer III maximum
+    ".aac": 512_000,
+    ".ogg": 500_000,
+    ".flac": 1_411_200,     # Never above 16-bit / 44.1 kHz stereo PCM
+    ".wav": 1_536_000,      # 16-bit / 48 kHz stereo PCM
+}
+
+
+# ⏱️ Segment length that keeps each chunk under the size limit at the given bitrate
+def _chunk_seconds(bit_rate, max_size_bytes):
+    return max(1, int(max_size_bytes * CHUNK_SIZE_HEADROOM * 8 / bit_rate))
+
+
+# 🛠️ ffmpeg command that stream-copies the first audio stream of `source` into fixed-length segments
+def _segment_command(source, chunk_seconds, pattern):
+    return [
+        "ffmpeg", "-v", "error", "-y",
+        "-i", source,
+        "-map", "0:a:0",            # First audio stream only (drops cover art / video)
+        "-c", "copy",
+        "-f", "segment",
+        "-segment_time", str(chunk_seconds),
+        "-reset_timestamps", "1",
+        pattern,
+    ]
+
+
+# 📂 Segment files written for an output prefix, in order
+def _list_segments(output_prefix, extension):
+    directory = os.path.dirname(output_prefix) or "."
+    prefix = os.path.basename(output_prefix) + "_part"
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.startswith(prefix) and name.endswith(extension)
+    )
+
+
+# 🗑️ Removes the segment files of an output prefix (also ones left behind by an interrupted earlier run,
+# which would otherwise be listed, and transcribed, with the new segments)
+def _remove_segments(output_prefix, extension):
+    for segment in _list_segments(output_prefix, extension):
+        os.remove(segment)
+
+
+# ✂️ Cuts an audio file into fixed-length segments by stream-copying packets (no decode, no re-encode)
+def _segment_audio(audio_path, chunk_seconds, output_prefix):
+    extension = os.path.splitext(audio_path)[1] or ".m4a"
+    pattern = f"{output_prefix}_part%03d{extension}"
 
+    _remove_segments(output_prefix, extension)
+    subprocess.run(_segment_command(audio_path, chunk_seconds, pattern), capture_output=True, check=True)
+    return _list_segments(output_prefix, extension)
 
-# 🎧 Splits an audio file into multiple smaller chunks based on Whisper API's max file size
+
+# ♻️ A VBR spike can push a segment over the limit; split just that segment again
+def _enforce_chunk_size(segment_paths, chunk_seconds, max_size_bytes):
+    chunks = []
+    for chunk_path in segment_paths:
+        if os.path.getsize(chunk_path) > max_size_bytes:
+            if chunk_seconds <= 1:
+                raise ValueError(f"Chunk {chunk_path} exceeds {max_size_bytes} bytes even at 1 second")
+
+            chunks.extend(split_audio_file(chunk_path, max_size_bytes))
+            os.remove(chunk_path)
+
+        else:
+            chunks.append(chunk_path)
+    return chunks
+
+
+# 🎧 Splits an audio file into chunks under Whisper API's max file size without loading it into memory
 def split_audio_file(audio_path, max_size_bytes=25 * 1024 * 1024):
-    print("🔍 Determining optimal chunk size for Whisper API...")
+    print("🔍 Determining chunk size from audio metadata...")
+
+    # 🎯 Derive the chunk duration from the container bitrate instead of trial exports
+    info = probe_audio(audio_path)
+    if not info["bit_rate"]:
+        raise ValueError(f"Could not determine bitrate of {audio_path}")
 
-    # Load full audio file using pydub
-    audio = AudioSegment.from_file(audio_path)
-    duration_ms = len(audio)
+    chunk_seconds = _chunk_seconds(info["bit_rate"], max_size_bytes)
     base_name = os.path.splitext(audio_path)[0]
-    
-    # 🎯 Try different durations to find the largest that fits under the size limit
-    test_durations = [15 * 60 * 1000, 10 * 60 * 1000, 5 * 60 * 1000]    # in milliseconds
-
-    for test_duration in test_durations:
-        test_chunk = audio[:test_duration]
-        test_path = f"{base_name}_test_chunk.m4a"
-        test_chunk.export(test_path, format="mp4")
-        size = os.path.getsize(test_path)
-        os.remove(test_path)
-        
-        if size <= max_size_bytes:
-            chunk_length_ms = test_duration
-            break
-    
-    # 🕐 If none of the test durations work, fall back to 1-minute chunks and shrink until valid
-    else:
-        chunk_length_ms = 60 * 1000
-        while True:
-            test_chunk = audio[:chunk_length_ms]
-            test_path = f"{base_name}_test_chunk.m4a"
-            test_chunk.export(test_path, format="mp4")
-            
-            if os.path.getsize(test_path) > max_size_bytes:
-                chunk_length_ms -= 10 * 1000
-                os.remove(test_path)
-            
-            else:
-                os.remove(test_path)
-                break
-
-    # 🔪 Split full audio file into final chunks
-    chunks = []
-    for i in range(0, duration_ms, chunk_length_ms):
-        chunk = audio[i : i + chunk_length_ms]
-        chunk_path = f"{base_name}_part{i // chunk_length_ms}.m4a"
-        chunk.export(chunk_path, format="mp4")
-        chunks.append(chunk_path)
 
-    print(f"🧩 Final chunk size: {chunk_length_ms // 1000} seconds")
+    # 🔪 Stream-copy the recording into segments; ffmpeg keeps memory flat regardless of length
+    chunks = _enforce_chunk_size(_segment_audio(audio_path, chunk_seconds, base_name), chunk_seconds, max_size_bytes)
+
+    print(f"🧩 Final chunk size: {chunk_seconds} seconds ({round(info['duration'] / 60, 1)} min total)")
     print(f"📂 Total chunks: {len(chunks)}")
-    return chunks
\ No newline at end of file
+    return chunks
+
+
+# 🚰 Splits a recording while it downloads: write_audio(sink) feeds bytes into ffmpeg's stdin, no temp file.
+# Chunks are sized for the format's highest expected bitrate (STREAM_BIT_RATES) unless bit_rate is given.
+def split_audio_stream(write_audio, output_prefix, extension=".mp3", bit_rate=None, max_size_bytes=25 * 1024 * 1024):
+    chunk_seconds = _chunk_seconds(bit_rate or STREAM_BIT_RATES[extension], max_size_bytes)
+    pattern = f"{output_prefix}_part%03d{extension}"
+    _remove_segments(output_prefix, extension)
+
+    # ffmpeg's log goes to a file so a chatty stderr can never fill a pipe and block the writer
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(
+            _segment_command("pipe:0", chunk_seconds, pattern),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+        )
+
+        try:
+            write_audio(process.stdin)
+            process.stdin.close()
+            returncode = process.wait()
+
+        except Exception:
+            process.kill()
+            process.wait()
+            _remove_segments(output_prefix, extension)
+            raise
+
+        if returncode != 0:
+            log.seek(0)
+            _remove_segments(output_prefix, extension)
+            raise subprocess.CalledProcessError(returncode, "ffmpeg", stderr=log.read())
+
+    chunks = _enforce_chunk_size(_list_segments(output_prefix, extension), chunk_seconds, max_size_bytes)
+
+    print(f"🧩 Streamed into {len(chunks)} chunk(s) of {chunk_seconds} seconds")
+    return chunks
@@ -0,0 +1,459 @@
+# 📦 Standard Libraries
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 🌐 Third-Party Libraries
+import httplib2
+import openai
+from googleapiclient.errors import HttpError
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+
+# ⏱️ Latency and error injection for one fake endpoint
+class Latency:
+
+    def __init__(self, mean_ms=0.0, jitter_ms=0.0, error_rate=0.0, seed=0):
+        self.mean = mean_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    # 😴 Sleeps for one sampled latency; returns True if this call should fail
+    def wait(self):
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._rng.gauss(self.mean, self.jitter)) if self.jitter else self.mean
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+
+        if delay:
+            time.sleep(delay)
+        return fail
+
+
+# 📄 Parses "--latency 40,10,0.02" style specs: mean ms, jitter ms, error rate
+def parse_latency(spec, seed=0):
+    parts = [float(part) for part in str(spec).split(",") if part.strip()] + [0.0, 0.0, 0.0]
+    return Latency(parts[0], parts[1], parts[2], seed=seed)
+
+
+# 🕐 RFC 3339 timestamp like Drive returns
+def _drive_time(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _http_error(status, reason):
+    return HttpError(httplib2.Response({"status": status, "reason": reason}), reason.encode("utf-8"))
+
+
+# 🧾 Mimics googleapiclient's request objects: .execute() runs the call
+class _Call:
+
+    def __init__(self, latency, handler):
+        self._latency = latency
+        self._handler = handler
+
+    def execute(self, num_retries=0):
+        if self._latency.wait():
+            raise _http_error(503, "Injected backend error")
+        return self._handler()
+
+
+# 📡 Serves Range requests for MediaIoBaseDownload (request.http / request.uri / request.headers)
+class _MediaHttp:
+
+    def __init__(self, content, latency):
+        self._content = content
+        self._latency = latency
+
+    def request(self, uri, method="GET", headers=None, **kwargs):
+        if self._latency.wait():
+            raise ConnectionResetError("Injected connection reset")
+
+        start, end = (int(value) for value in headers["range"].split("=", 1)[1].split("-"))
+        body = self._content[start:end + 1]
+        response = httplib2.Response({
+            "status": 206,
+            "content-range": f"bytes {start}-{start + len(body) - 1}/{len(self._content)}",
+        })
+        return response, body
+
+
+class _MediaRequest:
+
+    def __init__(self, file_id, content, latency):
+        self.http = _MediaHttp(content, latency)
+        self.uri = f"https://fake-drive.local/files/{file_id}?alt=media"
+        self.headers = {}
+
+
+# 🗂️ In-process stand-in for the Drive v3 files() resource used by this project
+class FakeDrive:
+
+    def __init__(self, latency=None, download_latency=None):
+        self.latency = latency or Latency()
+        self.download_latency = download_latency or Latency()
+        self.files_by_id = {}
+        self.content = {}
+        self.uploads = 0
+        self.uploaded_bytes = 0
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _new_id(self, prefix):
+        with self._lock:
+            self._next_id += 1
+            return f"{prefix}{self._next_id:06d}"
+
+    # ➕ Adds a folder and returns its ID
+    def add_folder(self, name, parent_id):
+        folder_id = self._new_id("fld")
+        self.files_by_id[folder_id] = {
+            "id": folder_id,
+            "name": name,
+            "mimeType": FOLDER_MIME_TYPE,
+            "parents": [parent_id],
+            "modifiedTime": _drive_time(time.time()),
+            "trashed": False,
+        }
+        return folder_id
+
+    # ➕ Adds a binary file (e.g. a recording) and returns its ID
+    def add_file(self, name, parent_id, content, mime_type="audio/wav"):
+        file_id = self._new_id("fil")
+        self.files_by_id[file_id] = {
+            "id": file_id,
+            "name": name,
+            "mimeType": mime_type,
+            "parents": [parent_id],
+            "size": str(len(content)),
+            "md5Checksum": hashlib.md5(content).hexdigest(),
+            "modifiedTime": _drive_time(time.time()),
+            "trashed": False,
+        }
+        self.content[file_id] = content
+        return file_id
+
+    # 🔎 Evaluates the subset of Drive query syntax this project sends
+    def _matches(self, file, query):
+        parents = re.findall(r"'([^']+)' in parents", query)
+        if parents and not set(parents) & set(file["parents"]):
+            return False
+        if "trashed = false" in query and file["trashed"]:
+            return False
+        if re.search(rf"mimeType\s*=\s*'{FOLDER_MIME_TYPE}'", query) and file["mimeType"] != FOLDER_MIME_TYPE:
+            return False
+        if re.search(rf"mimeType\s*!=\s*'{FOLDER_MIME_TYPE}'", query) and file["mimeType"] == FOLDER_MIME_TYPE:
+            return False
+
+        modified_after = re.search(r"modifiedTime > '([^']+)'", query)
+        if modified_after and file["modifiedTime"] <= modified_after.group(1):
+            return False
+
+        for name in re.findall(r"name = '([^']+)'", query):
+            if file["name"] != name:
+                return False
+        return True
+
+    def _public(self, file):
+        return {key: value for key, value in file.items() if key != "trashed"}
+
+    # 📚 files() resource
+    def files(self):
+        return self
+
+    def list(self, q="", fields=None, pageSize=100, pageToken=None, **kwargs):
+        def handler():
+            matches = sorted(
+                (file for file in self.files_by_id.values() if self._matches(file, q)),
+                key=lambda file: file["id"],
+            )
+            start = int(pageToken or 0)
+            page = matches[start:start + pageSize]
+            response = {"files": [self._public(file) for file in page]}
+            if start + pageSize < len(matches):
+                response["nextPageToken"] = str(start + pageSize)
+            return response
+
+        return _Call(self.latency, handler)
+
+    def get(self, fileId, fields=None, **kwargs):
+        def handler():
+            if fileId not in self.files_by_id:
+                raise _http_error(404, "File not found")
+            file = self.files_by_id[fileId]
+            return dict(file) if "trashed" in (fields or "") else self._public(file)
+
+        return _Call(self.latency, handler)
+
+    def get_media(self, fileId, **kwargs):
+        return _MediaRequest(fileId, self.content[fileId], self.download_latency)
+
+    def _store_upload(self, body, media_body, file_id=None):
+        size = media_body.size() if media_body is not None else 0
+        content = media_body.getbytes(0, size) if size else b""
+        with self._lock:
+            self.uploads += 1
+            self.uploaded_bytes += size
+
+        if file_id is None:
+            file_id = self._new_id("doc")
+            self.files_by_id[file_id] = {
+                "id": file_id,
+                "name": body.get("name", "Untitled"),
+                "mimeType": body.get("mimeType", "application/octet-stream"),
+                "parents": body.get("parents", []),
+                "trashed": False,
+            }
+        record = self.files_by_id[file_id]
+        record.update({key: value for key, value in body.items() if key != "parents"})
+        record["size"] = str(size)
+        record["md5Checksum"] = hashlib.md5(content).hexdigest()
+        record["modifiedTime"] = _drive_time(time.time())
+        self.content[file_id] = content
+        return self._public(record)
+
+    def create(self, body=None, media_body=None, fields=None, **kwargs):
+        return _Call(self.latency, lambda: self._store_upload(body or {}, media_body))
+
+    def update(self, fileId, body=None, media_body=None, fields=None, **kwargs):
+        def handler():
+            if fileId not in self.files_by_id:
+                raise _http_error(404, "File not found")
+            return self._store_upload(body or {}, media_body, fileId)
+
+        return _Call(self.latency, handler)
+
+
+# 📊 In-memory worksheet with the gspread calls main.py uses
+class FakeSheet:
+
+    def __init__(self, rows, latency=None, apply_writes=False):
+        self.rows = [list(row) for row in rows]
+        self.latency = latency or Latency()
+        self.apply_writes = apply_writes
+        self.batches = 0
+        self.cells_written = 0
+        self.spreadsheet = self
+        self._updated = time.time()
+
+    def _call(self):
+        if self.latency.wait():
+            raise RuntimeError("Injected Sheets API error")
+
+    def get_all_values(self):
+        self._call()
+        return [list(row) for row in self.rows]
+
+    def get_lastUpdateTime(self):
+        return _drive_time(self._updated)
+
+    def batch_update(self, data, value_input_option=None):
+        self._call()
+        self.batches += 1
+        self.cells_written += len(data)
+
+        if self.apply_writes:
+            for update in data:
+                column, row = re.match(r"([A-Z]+)(\d+)", update["range"]).groups()
+                col_index = ord(column) - ord("A")
+                row_values = self.rows[int(row) - 1]
+                row_values.extend([""] * (col_index + 1 - len(row_values)))
+                row_values[col_index] = update["values"][0][0]
+            self._updated = time.time()
+
+
+# 🤖 Replaces the openai 0.28 chat and audio calls with canned, schema-shaped responses
+class FakeOpenAI:
+
+    def __init__(self, chat_latency=None, audio_latency=None, throttle_rate=0.0, retry_after=0.5, malformed_rate=0.0, seed=0):
+        self.chat_latency = chat_latency or Latency()
+        self.audio_latency = audio_latency or Latency()
+        self.throttle_rate = throttle_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat_calls = 0
+        self.audio_calls = 0
+        self.throttled = 0
+        self.malformed = 0
+
+    def _maybe_throttle(self, latency):
+        failed = latency.wait()
+        with self._lock:
+            throttled = self._rng.random() < self.throttle_rate
+            if throttled:
+                self.throttled += 1
+        if throttled:
+            raise openai.error.RateLimitError(
+                "Rate limit reached (injected)", http_status=429, headers={"retry-after": str(self.retry_after)}
+            )
+        if failed:
+            raise openai.error.ServiceUnavailableError("Injected server error", http_status=503)
+
+    # 🧾 Meeting-style JSON for the transcript prompts, website-style JSON otherwise
+    def _chat_payload(self, messages):
+        system = (messages[0].get("content") or "") if messages else ""
+        prompt_chars = sum(len(message.get("content") or "") for message in messages)
+
+        if "transcript" in system.lower() or "minutes of the meeting" in system.lower():
+            content = (
+                '{"mom": ["**Kickoff**: reviewed goals and current marketing", "Agreed on a monthly reporting cadence"], '
+                '"todo_list": ["Agency: draft campaign plan by Friday", "Client: share brand assets"], '
+                '"action_plan": {"decision_made": ["Launch a local search campaign"], '
+                '"key_services_to_promote": ["Emergency repairs"], "target_geography": ["Metro area"], '
+                '"budget_and_timeline": ["$2,000 per month starting next month"], '
+                '"lead_management_strategy": ["Call tracking with weekly review"], '
+                '"next_steps_and_ownership": ["Agency sets up tracking"]}}'
+            )
+        else:
+            sections = ", ".join(
+                f'{{"heading": "{heading}", "content": "- **Key point** about {heading.lower()}\\n- Second detail"}}'
+                for heading in (
+                    "Purpose", "Target Audience", "About the Company", "Company Information",
+                    "Unique Selling Proposition (USP)", "Reviews/Testimonials", "Products/Service Categories", "Offers",
+                )
+            )
+            content = f'{{"title": "Synthetic Company", "sections": [{sections}]}}'
+
+        if len(messages) > 2:
+            content = self._follow_up(content, messages[-1].get("content") or "")
+        return self._usage_payload(self._maybe_malform(content), prompt_chars)
+
+    # 🎯 A follow-up asking for specific sections gets only those (the example structure follows "structure:")
+    def _follow_up(self, content, request):
+        wanted = json.loads(request.split("structure:", 1)[1])
+        data = json.loads(content)
+        if "sections" in wanted:
+            headings = {section["heading"] for section in wanted["sections"]}
+            return json.dumps({"sections": [section for section in data["sections"] if section["heading"] in headings]})
+        return json.dumps({
+            key: {name: data[key][name] for name in value} if isinstance(value, dict) else data[key]
+            for key, value in wanted.items()
+        })
+
+    # 🧨 Injected bad output: a trailing comma in a list (repairable locally) or a dropped last section (needs a re-ask)
+    def _maybe_malform(self, content):
+        with self._lock:
+            if self._rng.random() >= self.malformed_rate:
+                return content
+            self.malformed += 1
+            drop_section = self._rng.random() < 0.5
+
+        if not drop_section:
+            end = content.rindex("]")
+            return content[:end] + "," + content[end:]
+
+        data = json.loads(content)
+        if "sections" in data:
+            data["sections"].pop()
+        else:
+            data["action_plan"].popitem()
+        return json.dumps(data)
+
+    def _usage_payload(self, content, prompt_chars):
+        return openai.openai_object.OpenAIObject.construct_from({
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_chars // 4 + len(content) // 4,
+            },
+        })
+
+    def chat_create(self, messages=None, **params):
+        with self._lock:
+            self.chat_calls += 1
+        self._maybe_throttle(self.chat_latency)
+        return self._chat_payload(messages or [])
+
+    async def chat_acreate(self, messages=None, **params):
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: self.chat_create(messages=messages, **params))
+
+    # 🎧 Transcript length grows with the audio size (about one word per 1.5KB of audio)
+    def audio_transcribe(self, model=None, file=None, **params):
+        with self._lock:
+            self.audio_calls += 1
+        self._maybe_throttle(self.audio_latency)
+
+        size = len(file.read()) if file is not None else 0
+        words = max(20, size // 1500)
+        sentence = "We discussed the campaign budget, the target area and the next steps for the launch"
+        return " ".join((sentence.split() * (words // 15 + 1))[:words])
+
+    async def audio_atranscribe(self, model=None, file=None, **params):
+        return self.audio_transcribe(model=model, file=file, **params)
+
+    # 🔌 Swaps the module-level API for this fake
+    def install(self):
+        openai.ChatCompletion.create = self.chat_create
+        openai.ChatCompletion.acreate = self.chat_acreate
+        openai.Audio.transcribe = self.audio_transcribe
+        openai.Audio.atranscribe = self.audio_atranscribe
+
+
+# 🌐 Local HTTP server that serves synthetic sites ({path: html bytes}) with injected latency
+class FakeWebServer:
+
+    def __init__(self, pages, latency=None):
+        self.pages = pages
+        self.latency = latency or Latency()
+        self.requests = 0
+        self.not_modified = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                failed = server.latency.wait()
+                body = server.pages.get(self.path.split("?", 1)[0].rstrip("/"))
+
+                if failed or body is None:
+                    self.send_response(503 if failed else 404)
+                    self.end_headers()
+                    return
+
+                # 🏷️ Strong ETag from the body, so conditional requests can be answered with a 304
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
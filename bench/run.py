@@ -0,0 +1,275 @@
+# 📦 Standard Libraries
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+# 📁 Repository root, so the child process can import main.py after moving into its scratch directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 🎬 Scenarios: pipeline mode, how many passes over the sheet, and whether faults are injected
+SCENARIOS = {
+    "serial": {"pipeline": False, "passes": 1, "faults": False},
+    "pipeline": {"pipeline": True, "passes": 1, "faults": False},
+    "warm": {"pipeline": True, "passes": 2, "faults": False},      # Second pass resumes from ledger and caches
+    "faults": {"pipeline": True, "passes": 1, "faults": True},
+}
+
+# ⏱️ Default latencies per endpoint: mean ms, jitter ms, error rate (scaled by --speed; errors only in "faults")
+DEFAULT_LATENCIES = {
+    "drive": "120,30,0.02",
+    "download": "60,20,0.05",
+    "sheets": "250,50,0.0",
+    "chat": "2500,600,0.02",
+    "audio": "6000,1500,0.02",
+    "web": "150,60,0.05",
+}
+
+# 🚦 Share of OpenAI calls answered with a 429 in the "faults" scenario
+FAULT_THROTTLE_RATE = 0.1
+
+# 🧨 Share of chat replies with malformed JSON or a missing section in the "faults" scenario
+FAULT_MALFORMED_RATE = 0.2
+
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+# ⚙️ Parses command-line arguments
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark with fake Drive, Sheets, OpenAI and websites.")
+    parser.add_argument("--scenarios", default="serial,pipeline,warm,faults", help="Comma-separated: " + ", ".join(SCENARIOS))
+    parser.add_argument("--rows", type=int, default=20, help="Synthetic sheet rows")
+    parser.add_argument("--speed", type=float, default=0.1, help="Multiplier for all fake latencies (1.0 = realistic)")
+    parser.add_argument("--audio-seconds", type=float, default=60, help="Length of each synthetic recording")
+    parser.add_argument("--pages", type=int, default=3, help="Pages crawled per website (WEBSITE_CRAWL_MAX_PAGES)")
+    parser.add_argument("--seed", type=int, default=1)
+    for name, spec in DEFAULT_LATENCIES.items():
+        parser.add_argument(f"--{name}-latency", default=spec, help=f"mean_ms,jitter_ms,error_rate (default {spec})")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare rows/min against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed rows/min drop before failing (share)")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+# 🪄 Builds the fake world, runs main's job loop against it and returns the measurements (child process only)
+def run_child(args):
+    scenario = SCENARIOS[args.child]
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(tempfile.mkdtemp(prefix=f"fms-bench-{args.child}-"))
+
+    from bench.fakes import FakeDrive, FakeSheet, FakeOpenAI, FakeWebServer, parse_latency
+    from bench import synthetic
+
+    # 🎚️ Latencies scaled by --speed; error rates only apply to the fault scenario
+    def latency(name, seed_offset):
+        spec = getattr(args, f"{name}_latency")
+        model = parse_latency(spec, seed=args.seed + seed_offset)
+        model.mean *= args.speed
+        model.jitter *= args.speed
+        if not scenario["faults"]:
+            model.error_rate = 0.0
+        return model
+
+    # 🏗️ Synthetic world: one site and one recording folder per row
+    drive = FakeDrive(latency=latency("drive", 1), download_latency=latency("download", 2))
+    parent_id = drive.add_folder("Client Recordings", "root")
+    output_folder = drive.add_folder("Summaries", "root")
+    recording = synthetic.make_wav(args.audio_seconds, seed=args.seed)
+
+    pages = {}
+    folder_ids = []
+    for n in range(args.rows):
+        name = synthetic.company_name(n)
+        pages.update(synthetic.make_site(name, seed=args.seed))
+        folder_id = drive.add_folder(name, parent_id)
+        drive.add_file(f"{name} Meeting.wav", folder_id, recording)
+        folder_ids.append(folder_id)
+
+    web = FakeWebServer(pages, latency=latency("web", 3)).start()
+    rows = synthetic.make_sheet_rows(args.rows, web.base_url, folder_ids, blank_audio_every=5, seed=args.seed)
+    sheet = FakeSheet(rows, latency=latency("sheets", 4))
+    fake_openai = FakeOpenAI(
+        chat_latency=latency("chat", 5),
+        audio_latency=latency("audio", 6),
+        throttle_rate=FAULT_THROTTLE_RATE if scenario["faults"] else 0.0,
+        retry_after=max(0.05, 2 * args.speed),
+        malformed_rate=FAULT_MALFORMED_RATE if scenario["faults"] else 0.0,
+        seed=args.seed,
+    )
+
+    # 🔐 Settings are read at import time, so they are set before main is imported
+    os.environ.update({
+        "OPENAI_KEY": "sk-bench",
+        "AUDIO_PARENT_FOLDER_ID": parent_id,
+        "AUDIO_DRIVE_FOLDER_ID": output_folder,
+        "WEBSITE_DRIVE_FOLDER_ID": output_folder,
+        "WEBSITE_CRAWL_MAX_PAGES": str(args.pages),
+    })
+
+    import main
+    import audio.folder_index
+    import website.drive
+    from utils import drive_client, sheet_utils
+    from utils.metrics import get_metrics
+    from utils.openai_gateway import get_gateway
+    from utils.structured_output import get_structured_stats
+
+    fake_openai.install()
+    for module in (drive_client, audio.folder_index, website.drive):
+        module.get_drive_service = lambda api_key=None: drive
+    sheet_utils._sheet = sheet
+
+    # 🚀 Same loop as main.main(); the last pass is the one measured
+    for _ in range(scenario["passes"]):
+        rows_now, _ = main.get_all_rows()
+        started = time.perf_counter()
+        processed = main.run_jobs(main.iter_pending_jobs(rows_now), pipeline_mode=scenario["pipeline"])
+        elapsed = time.perf_counter() - started
+
+    web.stop()
+    stages = get_metrics().summary()
+    gateway = get_gateway().stats()
+
+    return {
+        "scenario": args.child,
+        "rows": args.rows,
+        "processed": processed,
+        "seconds": round(elapsed, 2),
+        "rows_per_min": round(processed / elapsed * 60, 2) if elapsed else 0.0,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": {
+            stage: {key: stats[key] for key in ("count", "errors", "p50", "p90", "p99", "max")}
+            for stage, stats in stages.items()
+        },
+        "openai": {key: gateway[key] for key in ("requests", "throttled", "retries", "max_queue_depth")},
+        "fakes": {
+            "drive_calls": drive.latency.calls,
+            "drive_errors": drive.latency.errors + drive.download_latency.errors,
+            "uploads": drive.uploads,
+            "sheet_batches": sheet.batches,
+            "web_requests": web.requests,
+            "chat_calls": fake_openai.chat_calls,
+            "audio_calls": fake_openai.audio_calls,
+            "malformed_replies": fake_openai.malformed,
+        },
+        "structured": get_structured_stats(),
+    }
+
+
+# 🧪 Runs one scenario in a fresh interpreter (isolated caches, ledger and peak RSS)
+def run_scenario(name, argv):
+    command = [sys.executable, "-m", "bench.run", "--child", name, *argv]
+    completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+
+    result = None
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+
+    if "--verbose" in argv or result is None:
+        print(completed.stdout)
+        print(completed.stderr, file=sys.stderr)
+    if result is None:
+        raise RuntimeError(f"Scenario {name} failed (exit code {completed.returncode})")
+    return result
+
+
+# 🖨️ Prints one scenario's headline numbers and per-stage latencies
+def print_result(result):
+    print(
+        f"\n🎬 {result['scenario']}: {result['processed']}/{result['rows']} row(s) in {result['seconds']}s — "
+        f"{result['rows_per_min']} rows/min, peak RSS {result['peak_rss_mb']}MB"
+    )
+    print(f"   {'stage':<14}{'count':>6}{'errors':>7}{'p50':>9}{'p90':>9}{'max':>9}")
+    for stage, stats in sorted(result["stages"].items(), key=lambda item: -item[1]["p90"]):
+        print(
+            f"   {stage:<14}{stats['count']:>6}{stats['errors']:>7}"
+            f"{stats['p50']:>8.2f}s{stats['p90']:>8.2f}s{stats['max']:>8.2f}s"
+        )
+    openai_stats = result["openai"]
+    print(
+        f"   🚦 OpenAI: {openai_stats['requests']} request(s), {openai_stats['throttled']} throttled, "
+        f"{openai_stats['retries']} retried, peak queue {openai_stats['max_queue_depth']}"
+    )
+    structured = result["structured"]
+    print(
+        f"   🧩 Structured output: {structured['repaired']} repaired, {structured['reasks']} re-ask(s), "
+        f"~{structured['tokens_saved']} completion token(s) saved"
+    )
+
+
+# 📉 Returns the scenarios whose throughput dropped more than `tolerance` below the baseline
+def find_regressions(results, baseline, tolerance):
+    previous = {result["scenario"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if before and result["rows_per_min"] < before["rows_per_min"] * (1 - tolerance):
+            regressions.append((result["scenario"], before["rows_per_min"], result["rows_per_min"]))
+    return regressions
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
+
+    if args.child:
+        print(RESULT_PREFIX + json.dumps(run_child(args)), flush=True)
+        return 0
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    print(f"🏁 Benchmark: {args.rows} row(s), latency x{args.speed}, {args.audio_seconds}s recordings, {args.pages} page(s)/site")
+    child_argv = _strip_values(argv, ("--json", "--baseline", "--scenarios", "--tolerance"))
+
+    results = []
+    for name in names:
+        result = run_scenario(name, child_argv)
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as results_file:
+            json.dump(results, results_file, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.tolerance)
+        for scenario, before, after in regressions:
+            print(f"❌ {scenario}: {before} → {after} rows/min (more than {int(args.tolerance * 100)}% slower)")
+        if regressions:
+            return 1
+        print("✅ No throughput regressions against the baseline.")
+
+    return 0
+
+
+# ✂️ Removes parent-only options (and their values) before passing arguments to a child process
+def _strip_values(argv, options):
+    kept = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        if arg in options:
+            skip = True
+            continue
+        if arg.startswith(tuple(f"{option}=" for option in options)):
+            continue
+        kept.append(arg)
+    return kept
+
+
+if __name__ == "__main__":
+    sys.exit(main())
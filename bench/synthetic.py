@@ -0,0 +1,143 @@
+# 📦 Standard Libraries
+import io
+import math
+import wave
+import array
+import random
+
+# 🏢 Word pools for company names and page copy
+NAME_PARTS = (
+    "Acme", "Summit", "Harbor", "Maple", "Pioneer", "Vertex", "Bright", "Cedar", "Northwind", "Blue",
+    "Granite", "Evergreen", "Lakeside", "Silver", "Redwood", "Atlas", "Orchid", "Falcon", "Prairie", "Coastal",
+)
+NAME_SUFFIXES = ("Dental", "Roofing", "Law Group", "Plumbing", "Fitness", "Realty", "HVAC", "Landscaping", "Auto Care", "Bakery")
+
+# 📃 Sentences per page type; keywords match the sections the website prompt asks for
+PAGE_COPY = {
+    "": (
+        "{name} helps families and businesses across the region with dependable {trade} services.",
+        "Our mission is to deliver honest work, fair pricing and a guarantee on every job.",
+        "Trusted by more than {customers} customers since {year}.",
+    ),
+    "about": (
+        "{name} was founded in {year} by a team with decades of experience in {trade}.",
+        "Our story started with one truck and a promise to treat every customer like a neighbor.",
+        "Today our certified team serves clients in {city} and the surrounding area.",
+    ),
+    "services": (
+        "We offer residential and commercial {trade} packages for every budget.",
+        "Our services include inspections, repairs, installations and maintenance plans.",
+        "Emergency appointments are available seven days a week.",
+    ),
+    "testimonials": (
+        "\"Fantastic service, on time and on budget. Highly recommend {name}!\" — rated 5 stars.",
+        "\"The team explained everything and the price was exactly as quoted.\" — happy customer.",
+        "Over {customers} reviews with an average rating of 4.8 stars.",
+    ),
+    "offers": (
+        "Limited time offer: 15% off your first service and a free estimate.",
+        "Seasonal promo: book before the end of the month and get a discount on maintenance plans.",
+    ),
+    "contact": (
+        "Call us at (555) 010-{phone} or email hello@{slug}.example.",
+        "Office hours: Monday to Friday 8am to 6pm. Address: {number} Main Street, {city}.",
+    ),
+}
+
+CITIES = ("Springfield", "Riverton", "Fairview", "Greenville", "Madison", "Franklin", "Clinton", "Georgetown")
+
+
+# 🏷️ Deterministic company name for row number n
+def company_name(n):
+    return f"{NAME_PARTS[n % len(NAME_PARTS)]} {NAME_SUFFIXES[(n // len(NAME_PARTS)) % len(NAME_SUFFIXES)]} {n}"
+
+
+# 🔤 URL-safe slug of a company name
+def slugify(name):
+    return "-".join(name.lower().split())
+
+
+# 🌐 Builds a small site ({path: html}) with shared nav/footer boilerplate and keyword-rich pages
+def make_site(name, pages=6, paragraphs=4, seed=0):
+    rng = random.Random(f"{name}-{seed}")
+    slug = slugify(name)
+    values = {
+        "name": name,
+        "slug": slug,
+        "trade": name.split(" ", 1)[1].rsplit(" ", 1)[0].lower(),
+        "customers": rng.randint(200, 5000),
+        "year": rng.randint(1975, 2018),
+        "city": rng.choice(CITIES),
+        "phone": rng.randint(1000, 9999),
+        "number": rng.randint(10, 999),
+    }
+
+    page_types = list(PAGE_COPY)[: max(1, pages)]
+    nav = "".join(f'<li><a href="/{slug}/{page}">{(page or "home").title()}</a></li>' for page in page_types)
+    header = f"<header><nav><ul>{nav}</ul></nav><div class='banner'>We use cookies. Accept all</div></header>"
+    footer = f"<footer><p>{name} — {values['number']} Main Street, {values['city']}</p><p>© {values['year']} All rights reserved</p></footer>"
+    script = "<script>window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments)}</script>"
+
+    site = {}
+    for page in page_types:
+        body = []
+        for _ in range(paragraphs):
+            sentences = [sentence.format(**values) for sentence in PAGE_COPY[page]]
+            rng.shuffle(sentences)
+            body.append("<p>" + " ".join(sentences) + "</p>")
+
+        html = (
+            f"<html><head><title>{name} | {(page or 'Home').title()}</title><style>body{{margin:0}}</style>{script}</head>"
+            f"<body>{header}<main><h1>{(page or name).title()}</h1>{''.join(body)}</main>{footer}</body></html>"
+        )
+        site[f"/{slug}/{page}".rstrip("/")] = html.encode("utf-8")
+    return site
+
+
+# 🎧 Mono 16-bit WAV with speech-like tone bursts separated by pauses (so silence trimming has work to do)
+def make_wav(seconds, sample_rate=16000, pause_share=0.3, seed=0):
+    rng = random.Random(seed)
+    samples = array.array("h")
+    total = int(seconds * sample_rate)
+
+    while len(samples) < total:
+        burst = int(rng.uniform(0.5, 3.0) * sample_rate)
+        frequency = rng.uniform(120, 300)
+        step = 2 * math.pi * frequency / sample_rate
+        samples.extend(int(8000 * math.sin(step * i)) for i in range(min(burst, total - len(samples))))
+
+        pause = int(rng.uniform(0.2, 4.0) * sample_rate * pause_share / 0.3)
+        samples.extend([0] * min(pause, max(0, total - len(samples))))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+# 📊 Sheet rows in the layout main.py reads; every `blank_audio_every`-th row relies on folder auto-fill
+def make_sheet_rows(rows, site_base_url, folder_ids, done_share=0.1, blank_audio_every=0, seed=0):
+    rng = random.Random(seed)
+    values = [["Date", "Company Name", "", "", "Website", "Audio Folder", "Audio Summary", "Website Summary", "Status"]]
+
+    for n in range(rows):
+        name = company_name(n)
+        folder_link = f"https://drive.google.com/drive/folders/{folder_ids[n]}"
+        if blank_audio_every and n % blank_audio_every == blank_audio_every - 1:
+            folder_link = ""
+
+        values.append([
+            f"2026-{1 + n % 12:02d}-{1 + n % 28:02d}",
+            name,
+            "",
+            "",
+            f"{site_base_url}/{slugify(name)}/",
+            folder_link,
+            "",
+            "",
+            "Done" if rng.random() < done_share else "",
+        ])
+    return values
@@ -1,35 +1,61 @@
 # 📦 Standard Libraries: built-in modules for OS and environment handling
+import time
+
+# ⏱️ Taken before any project import, so --import-report can show what startup costs
+STARTED_AT = time.perf_counter()
+
 import os
+import sys
+import shutil
+import signal
+import hashlib
+import argparse
+import tempfile
+import threading
 
-# 🌐 Third-Party Libraries: external dependencies (Google APIs, dotenv, etc.)
-from dotenv import load_dotenv
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+# ⚙️ Settings from the environment / .env (loaded once per process)
+from utils.config import env_str, env_float
 
 # 📊 Google Sheet Integration: functions to update summary results
-from utils.sheet_utils import update_sheet_with_links
+from utils.sheet_utils import update_sheet_with_links, get_sheet, get_sheet_writer, get_sheet_modified_time
+from utils.pipeline import StagedPipeline
+from utils.cache import get_summary_cache
+from utils.openai_gateway import get_gateway
+from utils.structured_output import get_structured_stats
+from utils.metrics import get_metrics, bind_row
+from utils.ledger import get_ledger, row_key, site_key, fingerprint
+from utils.drive_upload import file_exists
 
 # 🌐 Website Summarization Modules: extract and summarize website content
-from website.extract import extract_text_from_url
-from website.summarize import summarize_with_openai
+from website.crawl import crawl_site, normalize_url
+from website.assemble import assemble_website_text
+from website.summarize import summarize_with_openai, MODEL as WEBSITE_MODEL, TEMPERATURE as WEBSITE_TEMPERATURE, WEBSITE_PROMPT_TEMPLATE
+from website.http_cache import get_http_cache
 from website.document import create_docx_in_memory as create_website_doc
 from website.drive import upload_docx_to_gdrive
 
 # 🎧 Audio Summarization Modules: transcribe and summarize meeting audio
-from audio.transcription import transcribe_audio
+from audio.transcription import transcribe_audio, transcribe_chunks
 from audio.summarizer import generate_summary
 from audio.doc_generator import generate_docx as create_audio_doc
 from audio.drive_utils import (
     upload_file_to_drive_in_memory,
     download_audio_from_drive,
-    find_audio_file_in_folder,
+    stream_audio_from_drive,
+    find_audio_files_in_folders,
+    AUDIO_QUERY_BATCH_SIZE,
     find_folder_id_by_partial_name,
 )
-from audio.config import AUDIO_DRIVE_FOLDER_ID, GDRIVE_API_KEY
-from audio.utils import split_audio_file
+from audio.config import AUDIO_DRIVE_FOLDER_ID, GDRIVE_API_KEY, AUDIO_STREAM_SPLIT, AUDIO_PREPROCESS, WHISPER_MAX_BYTES
+from audio.utils import split_audio_file, split_audio_stream, STREAMABLE_EXTENSIONS
+from audio.preprocess import preprocess_audio, preprocess_audio_stream
+from audio.transcript_cache import get_cached_transcript, store_transcript, invalidate_transcript, file_version
+
+# ⏱️ Time spent importing the project modules (heavy SDKs are imported later, on first use)
+IMPORTED_AT = time.perf_counter()
 
-# 🔐 Load environment variables from .env file
-load_dotenv()
+# 🐢 Packages that are slow to import; --import-report shows which of them a run actually loaded
+HEAVY_MODULES = ("gspread", "oauth2client", "googleapiclient", "google_auth_oauthlib", "openai", "aiohttp", "docx", "bs4", "requests")
 
 
 # 🔗 Extracts the folder ID from a Google Drive URL (supports both formats)
@@ -48,162 +74,634 @@ def extract_drive_folder_id(link):
 
 # 📥 Fetches all rows from the configured Google Sheet using service account credentials
 def get_all_rows():
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(os.getenv("GOOGLE_SA_FILE"), scope)
-    client = gspread.authorize(creds)
-    sheet = client.open_by_key(os.getenv("GOOGLE_SHEET_ID")).sheet1
+    sheet = get_sheet()
     
     return sheet.get_all_values(), sheet
 
 
-# 🚀 Main orchestration function: processes each row in the Google Sheet
-def main():
-    print("📦 SmartSummarizer") # Starting point of the script
+# 🧾 Reads the relevant columns of a sheet row into a job dictionary
+def parse_row(idx, row):
+    company_name = row[1].strip() if len(row) > 1 else ""
+    website_url = row[4].strip() if len(row) > 4 else ""
 
-    # Get all rows from the Google Sheet
-    rows, sheet = get_all_rows()
-    processed_count = 0
+    return {
+        "row_index": idx,
+        "row_key": row_key(row[0] if len(row) > 0 else "", company_name),
+        "meeting_date": row[0].strip() if len(row) > 0 else "",
+        "company_name": company_name,
+        "website_url": website_url,
+        "site_key": site_key(normalize_url(website_url)) if website_url else "",
+        "audio_folder_link": row[5].strip() if len(row) > 5 else "",
+        "status": row[8].strip().lower() if len(row) > 8 else "",
+        "website_filename": f"{company_name} Website Summary.docx",
+        "audio_filename": f"{company_name} Meeting Notes.docx",
+    }
 
-    print(f"📊 Total Rows: {len(rows) - 1}")
 
-    # Iterate through each row in the sheet
-    for idx, row in enumerate(rows[1:], start=2):
-        meeting_date = row[0].strip() if len(row) > 0 else ""
-        company_name = row[1].strip() if len(row) > 1 else ""
-        website_url = row[4].strip() if len(row) > 4 else ""
-        audio_folder_link = row[5].strip() if len(row) > 5 else ""
-        status = row[8].strip().lower() if len(row) > 8 else ""
-
-        print(f"\n🔍 Row {idx} — Status  : {status or '[empty]'}")
-        print(f"   📅 Date         : {meeting_date or '[MISSING]'}")
-        print(f"   🏢 Company Name : {company_name or '[MISSING]'}")
-        print(f"   🌐 Website Link : {website_url or '[MISSING]'}")
-        print(f"   🎧 Audio Folder : {audio_folder_link or '[MISSING]'}")
-
-        # Skip if row already marked as "done"
-        if status == "done":
-            print(f"✅ Skipped: Already marked as Done.")
-            continue
+# ✅ Logs, auto-fills and validates a row; returns True if it should be summarized
+def prepare_row(job):
+    idx = job["row_index"]
 
-        # If audio folder is missing, try to auto-fill based on company name
-        if not audio_folder_link:
-            parent_drive_folder = os.getenv("AUDIO_PARENT_FOLDER_ID")
-            folder_id = find_folder_id_by_partial_name(company_name, parent_drive_folder, api_key=GDRIVE_API_KEY)
+    print(f"\n🔍 Row {idx} — Status  : {job['status'] or '[empty]'}")
+    print(f"   📅 Date         : {job['meeting_date'] or '[MISSING]'}")
+    print(f"   🏢 Company Name : {job['company_name'] or '[MISSING]'}")
+    print(f"   🌐 Website Link : {job['website_url'] or '[MISSING]'}")
+    print(f"   🎧 Audio Folder : {job['audio_folder_link'] or '[MISSING]'}")
 
-            # Auto-fill audio folder link if missing
-            if folder_id:
-                audio_folder_link = (f"https://drive.google.com/drive/folders/{folder_id}?usp=sharing")
-                sheet.update_cell(idx, 6, audio_folder_link)
-            
-            else:
-                print(f"❌ Could not auto-fill Audio Folder Link for: {company_name}")
-                print(f"⛔ Skipping Row {idx} — Required audio folder is missing.")
-                continue
-        
-        # Validate required fields
-        if (
-            not meeting_date
-            or not company_name
-            or not website_url
-            or not audio_folder_link
-        ):
-            print(f"⛔ Skipping Row {idx} — One or more required fields are missing.")
-            continue
+    # Skip if row already marked as "done"
+    if job["status"] == "done":
+        print(f"✅ Skipped: Already marked as Done.")
+        return False
 
-        print(f"✅ Row {idx} passed validation. Beginning summarization...")
+    # If audio folder is missing, try to auto-fill based on company name
+    if not job["audio_folder_link"]:
+        parent_drive_folder = env_str("AUDIO_PARENT_FOLDER_ID")
+        folder_id = find_folder_id_by_partial_name(job["company_name"], parent_drive_folder, api_key=GDRIVE_API_KEY)
 
-        # Prepare output filenames
-        website_filename = f"{company_name} Website Summary.docx"
-        audio_filename = f"{company_name} Meeting Notes.docx"
-        website_link_result = None
-        audio_link_result = None
+        # Auto-fill audio folder link if missing
+        if folder_id:
+            job["audio_folder_link"] = (f"https://drive.google.com/drive/folders/{folder_id}?usp=sharing")
+            get_sheet_writer().queue_cell(idx, 6, job["audio_folder_link"])
 
-        # 🌐 Website Summarization
-        try:
-            print(f"🌐 Extracting and summarizing website: {website_url}")
-            raw_text = extract_text_from_url(website_url)
-            summary = summarize_with_openai(raw_text)
-            doc_stream = create_website_doc(summary, f"{company_name} Website Summary")
-            drive_file_id = upload_docx_to_gdrive(doc_stream, website_filename)
-            website_link_result = (f"https://drive.google.com/file/d/{drive_file_id}/view")
-            print(f"✅ Website uploaded: {website_link_result}")
-        
-        except Exception as e:
-            print(f"❌ Website processing failed: {e}")
+        else:
+            print(f"❌ Could not auto-fill Audio Folder Link for: {job['company_name']}")
+            print(f"⛔ Skipping Row {idx} — Required audio folder is missing.")
+            return False
+
+    # Validate required fields
+    if (
+        not job["meeting_date"]
+        or not job["company_name"]
+        or not job["website_url"]
+        or not job["audio_folder_link"]
+    ):
+        print(f"⛔ Skipping Row {idx} — One or more required fields are missing.")
+        return False
+
+    return True
+
+
+# 🔑 Fingerprint of a site's normalized text plus everything else that shapes its summary document
+def website_fingerprint(raw_text, filename):
+    normalized = " ".join(raw_text.lower().split())
+    return fingerprint(normalized, WEBSITE_MODEL, WEBSITE_TEMPERATURE, WEBSITE_PROMPT_TEMPLATE, filename)
+
+
+# 🌐 Website branch: extract, summarize, render and upload; returns the Drive link or None
+def process_website(job, pipeline):
+    idx = job["row_index"]
+    ledger = get_ledger()
+    label = f"Row {idx} — "
+
+    # 🕸️ Crawl, drop boilerplate and duplicates, then pack the most relevant text into the token budget
+    def extract():
+        with pipeline.stage("fetch", "extract") as span:
+            pages = crawl_site(job["website_url"])
+            span["bytes"] = sum(len(page["text"].encode("utf-8")) for page in pages)
+            span["pages"] = len(pages)
+
+        text, text_stats = assemble_website_text(pages)
+        print(
+            f"🧩 Row {idx} — Website text: {text_stats['tokens']} token(s) from {text_stats['pages']} page(s), "
+            f"{text_stats['tokens_saved']} token(s) saved"
+        )
+
+        # ❌ Never summarize (or record in the ledger) an empty page set; the row is retried instead
+        if not text.strip():
+            raise ValueError(f"No website text left for {job['website_url']} after removing boilerplate.")
+        return text
+
+    def summarize():
+        with pipeline.stage("summarize"):
+            return summarize_with_openai(raw_text)
+
+    def render_and_upload():
+        with pipeline.stage("render") as span:
+            doc_stream = create_website_doc(summary, f"{job['company_name']} Website Summary")
+            span["bytes"] = doc_stream.getbuffer().nbytes
+
+        with pipeline.stage("upload") as span:
+            span["bytes"] = doc_stream.getbuffer().nbytes
+            return upload_docx_to_gdrive(doc_stream, job["website_filename"])
+
+    try:
+        print(f"🌐 Row {idx} — Extracting and summarizing website: {job['website_url']}")
+
+        # ⏭️ Each stage is skipped when the ledger already holds its output for the same inputs
+        raw_text = ledger.resume(job["row_key"], "website_text", fingerprint(job["website_url"]), extract, label)
+
+        # 🧹 Empty text recorded by an older run is never reused (it would match every other failed crawl)
+        if not raw_text.strip():
+            raw_text = extract()
+            ledger.put(job["row_key"], "website_text", fingerprint(job["website_url"]), raw_text)
+
+        # ♻️ Site content unchanged since this client's last summary: skip GPT, render and upload entirely
+        site_fingerprint = website_fingerprint(raw_text, job["website_filename"])
+        previous = ledger.get(job["site_key"], "site_summary", site_fingerprint)
+
+        if previous and file_exists(previous["file_id"]):
+            print(f"♻️ Row {idx} — Website unchanged since its last summary; reusing summary and document.")
+            summary, drive_file_id = previous["summary"], previous["file_id"]
+
+        # 🗑️ The summary still applies, but its document was deleted: upload it again rather than link a dead file
+        elif previous:
+            print(f"⚠️ Row {idx} — Previous website document {previous['file_id']} no longer exists; uploading it again.")
+            summary = previous["summary"]
+            drive_file_id = render_and_upload()
+            ledger.put(job["row_key"], "website_upload", fingerprint(summary, job["website_filename"]), drive_file_id)
+            ledger.put(job["site_key"], "site_summary", site_fingerprint, {"summary": summary, "file_id": drive_file_id})
+
+        else:
+            summary = ledger.resume(job["row_key"], "website_summary", fingerprint(raw_text), summarize, label)
+            drive_file_id = ledger.resume(
+                job["row_key"], "website_upload", fingerprint(summary, job["website_filename"]), render_and_upload, label
+            )
+            ledger.put(job["site_key"], "site_summary", site_fingerprint, {"summary": summary, "file_id": drive_file_id})
+
+        website_link_result = (f"https://drive.google.com/file/d/{drive_file_id}/view")
+        print(f"✅ Row {idx} — Website uploaded: {website_link_result}")
+        return website_link_result
+
+    except Exception as e:
+        print(f"❌ Row {idx} — Website processing failed: {e}")
+        return None
+
+
+# 🎧 Audio branch: download, transcribe, summarize, render and upload; returns the Drive link or None
+def process_audio(job, pipeline):
+    idx = job["row_index"]
+    ledger = get_ledger()
+    label = f"Row {idx} — "
+
+    # 🎙️ Download and transcribe the recording (unchanged recordings come from the transcript store)
+    def transcribe():
+        transcript = get_cached_transcript(file_id, file_metadata)
+        if transcript is not None:
+            print(f"♻️ Row {idx} — Transcript served from cache: {file_metadata.get('name')}")
+            return transcript
+
+        suffix = os.path.splitext(file_metadata["name"])[1].lower() or ".m4a"
+        expected_md5 = file_metadata.get("md5Checksum")
+        size = file_metadata.get("size") or 0
+
+        # 📂 Streamed segments and transcodes go to a private directory per attempt, so two rows streaming the
+        # same recording at once (pipeline mode) never clear or delete each other's files
+        work_dir = tempfile.mkdtemp(prefix=f"audio_{file_id}_")
+        output_prefix = os.path.join(work_dir, "audio")
+
+        def download(sink):
+            return stream_audio_from_drive(file_id, sink, api_key=GDRIVE_API_KEY, expected_md5=expected_md5)
+
+        # 🚰 Pipe-friendly recordings can go from Drive straight into ffmpeg (no temp file)
+        streamable = AUDIO_STREAM_SPLIT and suffix in STREAMABLE_EXTENSIONS
+        stream_split = streamable and size > WHISPER_MAX_BYTES
+        audio_paths = []
+        chunks = None
 
-        # 🎧 Audio Summarization
         try:
-            print(f"🎧 Searching audio folder: {audio_folder_link}")
-            folder_id = extract_drive_folder_id(audio_folder_link)
-            
-            if not folder_id:
-                raise Exception("Invalid or missing folder ID.")
-
-            file_id = find_audio_file_in_folder(folder_id, extension=".m4a", api_key=GDRIVE_API_KEY)
-            if not file_id:
-                raise Exception("No .m4a file found in folder.")
-
-            print("🎙️ Transcribing and summarizing audio...")
-            audio_path = download_audio_from_drive(file_id, api_key=GDRIVE_API_KEY)
-            transcript = ""
-            audio_size_bytes = os.path.getsize(audio_path)
-
-            # Use direct transcription if file is under 25MB
-            if audio_size_bytes <= 25 * 1024 * 1024:
-                print("🎙️ Transcribing with OpenAI Whisper API (single file)...")
-                transcript = transcribe_audio(audio_path)
-            
-            # # Split large audio into smaller chunks
+            # 🗜️ The streamed transcode is CPU-bound ffmpeg work, so it holds a preprocess slot rather than a fetch slot
+            if streamable and AUDIO_PREPROCESS:
+                with pipeline.stage("preprocess") as span:
+                    span["bytes"] = size
+                    print(f"🚰 Row {idx} — Streaming audio into the speech transcoder...")
+                    audio_paths.append(preprocess_audio_stream(download, output_prefix, size))
+
             else:
+                with pipeline.stage("fetch", "download") as span:
+                    span["bytes"] = size
+                    if stream_split:
+                        print(f"🚰 Row {idx} — Streaming {round(size / 1024 / 1024, 2)}MB of audio into the splitter...")
+                        chunks = split_audio_stream(download, output_prefix=output_prefix, extension=suffix)
+
+                    else:
+                        print(f"🎙️ Row {idx} — Downloading audio...")
+                        audio_paths.append(download_audio_from_drive(
+                            file_id, api_key=GDRIVE_API_KEY, suffix=suffix, expected_md5=expected_md5
+                        ))
+
+            # 🗜️ Shrink a downloaded recording to a compact speech encode before it is uploaded to Whisper
+            if AUDIO_PREPROCESS and audio_paths and not streamable:
+                with pipeline.stage("preprocess") as span:
+                    preprocessed_path = preprocess_audio(audio_paths[-1])
+                    span["bytes"] = os.path.getsize(preprocessed_path)
+                if preprocessed_path != audio_paths[-1]:
+                    audio_paths.append(preprocessed_path)
+
+            # # Split large audio into smaller chunks
+            if audio_paths and os.path.getsize(audio_paths[-1]) > WHISPER_MAX_BYTES:
+                audio_size_bytes = os.path.getsize(audio_paths[-1])
                 print(f"📦 Audio is {round(audio_size_bytes / 1024 / 1024, 2)}MB — splitting for transcription.")
-                chunks = split_audio_file(audio_path)
-                all_transcripts = []
-
-                # Transcribe each chunk individually
-                for i, chunk_path in enumerate(chunks, start=1):
-                    print(f"📝 Transcribing chunk {i}/{len(chunks)}: {os.path.basename(chunk_path)}")
-                    chunk_transcript = transcribe_audio(chunk_path)
-                    all_transcripts.append(chunk_transcript)
-                    os.remove(chunk_path)
-
-                transcript = "\n".join(all_transcripts)
-            
-            # Summarize and export audio content
-            summary_data = generate_summary(transcript)
-            docx_file = create_audio_doc(summary_data, company_name, meeting_date)
-            file_id_uploaded = upload_file_to_drive_in_memory(
+                with pipeline.stage("preprocess", "split") as span:
+                    span["bytes"] = audio_size_bytes
+                    chunks = split_audio_file(audio_paths[-1], WHISPER_MAX_BYTES)
+
+            with pipeline.stage("transcribe") as span:
+                # Use direct transcription if file is under 25MB
+                if chunks is None:
+                    span["bytes"] = os.path.getsize(audio_paths[-1])
+                    print("🎙️ Transcribing with OpenAI Whisper API (single file)...")
+                    transcript = transcribe_audio(audio_paths[-1])
+
+                # Transcribe the chunks in parallel and reassemble them in order
+                else:
+                    span["bytes"] = sum(os.path.getsize(chunk) for chunk in chunks)
+                    span["chunks"] = len(chunks)
+                    transcript = transcribe_chunks(chunks)
+
+        # 🧹 Chunks normally remove themselves once transcribed; this also covers a failure between the split
+        # and transcribe_chunks taking them over
+        finally:
+            for path in audio_paths + (chunks or []):
+                if os.path.exists(path):
+                    os.remove(path)
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        store_transcript(file_id, file_metadata, transcript)
+        return transcript
+
+    # Summarize and export audio content
+    def summarize():
+        with pipeline.stage("summarize"):
+            return generate_summary(transcript)
+
+    def render_and_upload():
+        with pipeline.stage("render") as span:
+            docx_file = create_audio_doc(summary_data, job["company_name"], job["meeting_date"])
+            span["bytes"] = docx_file.getbuffer().nbytes
+
+        with pipeline.stage("upload") as span:
+            span["bytes"] = docx_file.getbuffer().nbytes
+            return upload_file_to_drive_in_memory(
                 docx_file,
                 folder_id=AUDIO_DRIVE_FOLDER_ID,
-                final_name=audio_filename,
+                final_name=job["audio_filename"],
+                key=f"{job['row_key']}:meeting-notes",     # Per meeting: one company can have several
             )
-            audio_link_result = (f"https://drive.google.com/file/d/{file_id_uploaded}/view")
-            os.remove(audio_path)
-            print(f"✅ Audio uploaded: {audio_link_result}")
-        
-        except Exception as e:
-            print(f"❌ Audio processing failed: {e}")
-
-        # ✅ Update the Google Sheet if any file was successfully uploaded
-        if website_link_result or audio_link_result:
-            update_sheet_with_links(
-                row_index=idx,
-                meeting_url=audio_link_result,
-                meeting_name=audio_filename,
-                website_url=website_link_result,
-                website_name=website_filename,
-            )
-            print(f"✅ Row {idx} updated in sheet and marked as 'Done'.")
-            processed_count += 1
-        
-        else:
-            print("⚠️ No uploads succeeded. Row not marked as Done.")
+
+    try:
+        if not job.get("audio_folder_id"):
+            raise Exception("Invalid or missing folder ID.")
+
+        file_metadata = job.get("audio_file")
+        if not file_metadata:
+            raise Exception("No audio file found in folder.")
+
+        file_id = file_metadata["id"]
+        print(f"🎯 Row {idx} — Found audio file: {file_metadata['name']}")
+
+        # ⏭️ Each stage is skipped when the ledger already holds its output for the same inputs
+        transcript = ledger.resume(
+            job["row_key"], "transcript", fingerprint(file_id, file_version(file_metadata)), transcribe, label
+        )
+        summary_data = ledger.resume(job["row_key"], "audio_summary", fingerprint(transcript), summarize, label)
+        file_id_uploaded = ledger.resume(
+            job["row_key"],
+            "audio_upload",
+            fingerprint(summary_data, job["company_name"], job["meeting_date"], job["audio_filename"]),
+            render_and_upload,
+            label,
+        )
+
+        audio_link_result = (f"https://drive.google.com/file/d/{file_id_uploaded}/view")
+        print(f"✅ Row {idx} — Audio uploaded: {audio_link_result}")
+        return audio_link_result
+
+    except Exception as e:
+        print(f"❌ Row {idx} — Audio processing failed: {e}")
+        return None
+
+
+# 🔀 Runs the website and audio branches of a row (concurrently in pipeline mode)
+def process_row(job, pipeline):
+    print(f"✅ Row {job['row_index']} passed validation. Beginning summarization...")
+
+    # 🪪 Metrics recorded by either branch are tagged with the row (branches may run on different threads)
+    def branch(process):
+        with bind_row(job["row_index"]):
+            return process(job, pipeline)
+
+    website_link_result, audio_link_result = pipeline.run_branches(
+        lambda: branch(process_website),
+        lambda: branch(process_audio),
+    )
+    return {"website_link": website_link_result, "audio_link": audio_link_result}
+
+
+# 📒 Sheet writes waiting for their batch to be flushed, by row number
+pending_sheet_writes = {}
+
+
+# 📒 Records in the ledger that a row's links were queued for the sheet. A record still "queued" from an earlier
+# run means its uploads finished but the batch never reached the sheet (e.g. a crash before the flush).
+def record_sheet_write(job, website_link_result, audio_link_result):
+    ledger = get_ledger()
+    entry = (
+        job["row_key"],
+        fingerprint(website_link_result, audio_link_result),
+        {"website_link": website_link_result, "audio_link": audio_link_result},
+    )
+
+    previous = ledger.get(entry[0], "sheet_write", entry[1])
+    if previous and previous.get("status") == "queued":
+        print(f"♻️ Row {job['row_index']} — Links from an interrupted run never reached the sheet; writing them again.")
+
+    pending_sheet_writes[job["row_index"]] = entry
+    ledger.put(entry[0], "sheet_write", entry[1], {**entry[2], "status": "queued"})
+
+
+# 📒 Marks rows as written in the ledger once the sheet writer has flushed them
+def mark_sheet_writes_flushed(row_numbers):
+    for row_number in row_numbers:
+        entry = pending_sheet_writes.pop(row_number, None)
+        if entry:
+            get_ledger().put(entry[0], "sheet_write", entry[1], {**entry[2], "status": "written"})
+
+
+# ✅ Writes a row's results back to the Google Sheet; returns True if it was marked as Done
+def commit_row(job, result):
+    idx = job["row_index"]
+    website_link_result = result["website_link"] if result else None
+    audio_link_result = result["audio_link"] if result else None
+
+    # ✅ Update the Google Sheet if any file was successfully uploaded
+    if website_link_result or audio_link_result:
+        # Recorded first: queuing the links can trigger a flush, which marks the record as written
+        record_sheet_write(job, website_link_result, audio_link_result)
+        update_sheet_with_links(
+            row_index=idx,
+            meeting_url=audio_link_result,
+            meeting_name=job["audio_filename"],
+            website_url=website_link_result,
+            website_name=job["website_filename"],
+        )
+        print(f"✅ Row {idx} queued for sheet update and marked as 'Done'.")
+        return True
+
+    print(f"⚠️ Row {idx} — No uploads succeeded. Row not marked as Done.")
+    return False
+
+
+# 📋 Yields the validated jobs of the sheet in row order (optionally only selected rows, until stop is set)
+def iter_pending_jobs(rows, only_rows=None, stop=None):
+    for idx, row in enumerate(rows[1:], start=2):
+        if stop is not None and stop.is_set():
+            return
+        if only_rows is not None and idx not in only_rows:
+            continue
+
+        job = parse_row(idx, row)
+        if prepare_row(job):
+            yield job
+
+
+# 🎧 Resolves the audio files of the jobs in batches (one combined Drive listing per batch)
+def attach_audio_files(jobs, batch_size=AUDIO_QUERY_BATCH_SIZE):
+    batch = []
+
+    for job in jobs:
+        job["audio_folder_id"] = extract_drive_folder_id(job["audio_folder_link"])
+        batch.append(job)
+
+        if len(batch) >= batch_size:
+            yield from _resolve_audio_batch(batch)
+            batch = []
+
+    if batch:
+        yield from _resolve_audio_batch(batch)
+
+
+# 🔍 Looks up one batch of folders and stores each folder's chosen recording on its job
+def _resolve_audio_batch(batch):
+    folder_ids = [job["audio_folder_id"] for job in batch if job["audio_folder_id"]]
+
+    try:
+        files = find_audio_files_in_folders(folder_ids, api_key=GDRIVE_API_KEY)
+        print(f"🎧 Resolved audio for {len(folder_ids)} folder(s) in one batch.")
+
+    except Exception as e:
+        print(f"❌ Audio discovery failed for rows {batch[0]['row_index']}–{batch[-1]['row_index']}: {e}")
+        files = {}
+
+    for job in batch:
+        job["audio_file"] = files.get(job["audio_folder_id"])
+    return batch
+
+
+# 🏭 Runs jobs through the (serial or concurrent) pipeline and flushes the sheet afterwards
+def run_jobs(jobs, pipeline_mode=False, commit=commit_row):
+
+    # 📒 Stage outputs are checkpointed in the job ledger; sheet writes are confirmed after each flush
+    get_sheet_writer().add_flush_listener(mark_sheet_writes_flushed)
+
+    # Serial mode handles one row at a time; pipeline mode overlaps rows and stages
+    get_metrics().start_run()
+    pipeline = StagedPipeline(concurrent=pipeline_mode)
+    try:
+        return pipeline.run(attach_audio_files(jobs), process_row, commit)
+
+    # 📝 Write any buffered sheet updates, even if the run was interrupted
+    finally:
+        try:
+            get_sheet_writer().flush()
+        finally:
+            report_run_metrics()
+
+
+# ⏱️ Prints per-stage percentiles and exports the run's metrics for Prometheus
+def report_run_metrics():
+    metrics = get_metrics()
+    metrics.print_summary()
+
+    openai_stats = get_gateway().stats()
+    structured_stats = get_structured_stats()
+    try:
+        metrics.write_prometheus(extra_gauges={
+            "fms_openai_requests": openai_stats["requests"],
+            "fms_openai_throttled": openai_stats["throttled"],
+            "fms_openai_retries": openai_stats["retries"],
+            "fms_openai_max_queue_depth": openai_stats["max_queue_depth"],
+            "fms_openai_concurrency_limit": openai_stats["concurrency_limit"],
+            "fms_structured_repaired": structured_stats["repaired"],
+            "fms_structured_reasks": structured_stats["reasks"],
+            "fms_structured_tokens_saved": structured_stats["tokens_saved"],
+        })
+    except OSError as e:
+        print(f"⚠️ Could not write Prometheus metrics: {e}")
+
+
+# 🚀 Main orchestration function: processes each row in the Google Sheet
+def main(pipeline_mode=False):
+    print("📦 SmartSummarizer") # Starting point of the script
+
+    # Get all rows from the Google Sheet
+    rows, _ = get_all_rows()
+    print(f"📊 Total Rows: {len(rows) - 1}")
+
+    # ⚡ Nothing to do: exit before the pipeline, ledger, OpenAI client and Drive are ever loaded
+    if not any(is_pending(row) for row in rows[1:]):
+        print("✅ No pending rows — nothing to do.")
+        return
+
+    processed_count = run_jobs(iter_pending_jobs(rows), pipeline_mode=pipeline_mode)
 
     print(f"\n📊 Summary: {processed_count} row(s) processed and marked as Done.")
 
+    cache_stats = get_summary_cache().stats()
+    print(f"♻️ Summary cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es)")
+
+    http_cache = get_http_cache()
+    if http_cache:
+        http_stats = http_cache.stats()
+        print(f"🌐 HTTP cache: {http_stats['revalidated']} page(s) not modified (304), {http_stats['refetched']} changed")
+
+    openai_stats = get_gateway().stats()
+    print(
+        f"🚦 OpenAI: {openai_stats['requests']} request(s), {openai_stats['throttled']} throttled, "
+        f"{openai_stats['retries']} retried, peak queue {openai_stats['max_queue_depth']}"
+    )
+
+    structured_stats = get_structured_stats()
+    print(
+        f"🧩 Structured output: {structured_stats['repaired']} reply(ies) repaired locally, "
+        f"{structured_stats['sections_reasked']} section(s) re-asked in {structured_stats['reasks']} follow-up(s), "
+        f"~{structured_stats['tokens_saved']} completion token(s) saved vs. full regeneration"
+    )
+
+
+# 🔑 Hash of the columns that decide whether a row needs work (date, company, website, audio, status)
+def row_fingerprint(row):
+    relevant = [row[i].strip() if len(row) > i else "" for i in (0, 1, 4, 5, 8)]
+    return hashlib.sha1("\x1f".join(relevant).encode("utf-8")).hexdigest()
+
+
+# 🟡 True if a row is not marked Done yet
+def is_pending(row):
+    return (row[8].strip().lower() if len(row) > 8 else "") != "done"
+
+
+# 👀 Daemon mode: polls the sheet, dispatches only new or changed pending rows, stops on SIGTERM
+def watch(interval=60, pipeline_mode=False, retry_after=1800):
+    stop = threading.Event()
+
+    def request_stop(signum, _frame):
+        print(f"\n🛑 Received {signal.Signals(signum).name} — finishing in-flight rows, then exiting.")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    print(f"👀 Watching the job sheet every {interval}s (Ctrl+C or SIGTERM to stop)")
+
+    dispatched = {}             # row number -> (row fingerprint, time of last attempt)
+    last_modified = None
+
+    while not stop.is_set():
+        try:
+            # 🕐 Cheap check first: skip reading the sheet when the spreadsheet has not changed
+            modified = get_sheet_modified_time()
+            retry_due = any(
+                time.time() - attempted > retry_after
+                for _, attempted in dispatched.values()
+            )
+
+            if modified and modified == last_modified and not retry_due:
+                stop.wait(interval)
+                continue
+
+            rows, _ = get_all_rows()
+            last_modified = modified
+
+            # 🔍 New rows, edited rows and failed rows whose retry delay has passed
+            pending = {}
+            for idx, row in enumerate(rows[1:], start=2):
+                if is_pending(row):
+                    pending[idx] = row_fingerprint(row)
+
+            due = set()
+            for idx, fingerprint_ in pending.items():
+                previous = dispatched.get(idx)
+                if not previous or previous[0] != fingerprint_ or time.time() - previous[1] > retry_after:
+                    due.add(idx)
+
+            # Rows that left the pending set (marked Done or deleted) are forgotten
+            for idx in list(dispatched):
+                if idx not in pending:
+                    del dispatched[idx]
+
+            print(f"📥 Backlog: {len(pending)} pending row(s), {len(due)} new or changed to dispatch")
+
+            if due:
+                for idx in due:
+                    dispatched[idx] = (pending[idx], time.time())
+
+                processed_count = run_jobs(
+                    iter_pending_jobs(rows, only_rows=due, stop=stop),
+                    pipeline_mode=pipeline_mode,
+                )
+                print(f"📊 Cycle done: {processed_count} row(s) marked as Done, {len(pending) - processed_count} still pending")
+
+        except Exception as e:
+            print(f"❌ Watch cycle failed: {e}")
+
+        stop.wait(interval)
+
+    get_sheet_writer().close()
+    print("👋 Watch mode stopped.")
+
+
+# 🧭 Parses command-line options
+def parse_args():
+    parser = argparse.ArgumentParser(description="Summarize websites and meeting audio listed in the job sheet.")
+    parser.add_argument(
+        "--invalidate-transcript",
+        metavar="FILE_ID",
+        help="Drop the cached transcript of a Drive audio file and exit.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and poll the sheet for new or changed rows.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=env_float("WATCH_INTERVAL_SECONDS", 60),
+        help="Seconds between sheet polls in watch mode (default: WATCH_INTERVAL_SECONDS or 60).",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Process rows concurrently with bounded per-stage limits (PIPELINE_* settings in .env).",
+    )
+    parser.add_argument(
+        "--import-report",
+        action="store_true",
+        help="Print startup timings and which heavy packages were imported (see also: python -X importtime main.py).",
+    )
+    return parser.parse_args()
+
+
+# ⏱️ Prints how long startup and the run took and which heavy packages ended up imported
+def print_import_report(finished_at):
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    skipped = [name for name in HEAVY_MODULES if name not in sys.modules]
+
+    print(f"\n⏱️ Startup: project imports {round((IMPORTED_AT - STARTED_AT) * 1000)}ms, run {round(finished_at - IMPORTED_AT, 2)}s")
+    print(f"   🐢 Loaded : {', '.join(loaded) or '-'}")
+    print(f"   💤 Skipped: {', '.join(skipped) or '-'}")
+    print("   🔬 Per-module breakdown: python -X importtime main.py 2> importtime.log")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+
+    if args.invalidate_transcript:
+        removed = invalidate_transcript(args.invalidate_transcript)
+        print(f"🗑️ Transcript cache entry {'removed' if removed else 'not found'}: {args.invalidate_transcript}")
+    elif args.watch:
+        watch(interval=args.interval, pipeline_mode=args.pipeline)
+    else:
+        main(pipeline_mode=args.pipeline)
+
+    if args.import_report:
+        print_import_report(time.perf_counter())
@@ -0,0 +1,89 @@
+# 📦 Standard Libraries
+import socket
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from website import extract
+from website.crawl import crawl_site
+
+# 🌐 Pages served by the local test site (path -> (content type, body))
+SITE = {
+    "/": ("text/html", '<html><body><nav><a href="/about">About</a> <a href="/services?utm_source=x">Services</a>'
+                       ' <a href="https://elsewhere.example/">Out</a></nav><p>Welcome to Acme Plumbing.</p></body></html>'),
+    "/about": ("text/html", '<html><body><p>Founded in 1999 by two brothers.</p><a href="/">Home</a></body></html>'),
+    "/services": ("text/html", "<html><body><p>Emergency repairs and boiler servicing.</p></body></html>"),
+    "/empty": ("text/html", "<html><head><script>var x = 1;</script></head><body></body></html>"),
+    "/logo.png": ("image/png", "not html"),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        page = SITE.get(self.path.split("?")[0])
+        if page is None:
+            self.send_error(404)
+            return
+
+        body = page[1].encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"{page[0]}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(monkeypatch):
+    monkeypatch.setattr(extract, "get_http_cache", lambda: None)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_crawls_same_site_pages(site):
+    pages = crawl_site(site + "/", max_pages=5, max_depth=2, use_sitemap=False)
+
+    texts = [page["text"] for page in pages]
+    assert "Welcome to Acme Plumbing." in texts[0]
+    assert any("Founded in 1999" in text for text in texts)
+    assert any("Emergency repairs" in text for text in texts)
+    assert len(pages) == 3                      # Home is not crawled twice; the external link is skipped
+
+
+def test_respects_page_budget(site):
+    assert len(crawl_site(site + "/", max_pages=1, use_sitemap=False)) == 1
+
+
+def test_missing_start_page_raises(site):
+    with pytest.raises(Exception):
+        crawl_site(site + "/missing", max_pages=3, use_sitemap=False)
+
+
+def test_unreachable_site_raises(site):
+    with pytest.raises(Exception):
+        crawl_site(f"http://127.0.0.1:{_closed_port()}/", max_pages=3, use_sitemap=False)
+
+
+def test_non_html_start_page_raises(site):
+    with pytest.raises(ValueError):
+        crawl_site(site + "/logo.png", max_pages=3, use_sitemap=False)
+
+
+def test_start_page_without_text_raises(site):
+    with pytest.raises(ValueError):
+        crawl_site(site + "/empty", max_pages=3, use_sitemap=False)
@@ -0,0 +1,177 @@
+# 📦 Standard Libraries
+import os
+import json
+import time
+import hashlib
+import threading
+
+from utils.config import env_str, env_int, env_float
+
+# ⚙️ Shared GPT summary cache settings (override in .env)
+SUMMARY_CACHE_DIR = env_str("SUMMARY_CACHE_DIR", os.path.join(".cache", "summaries"))
+SUMMARY_CACHE_MAX_MB = env_int("SUMMARY_CACHE_MAX_MB", 200)
+SUMMARY_CACHE_TTL_DAYS = env_float("SUMMARY_CACHE_TTL_DAYS", 30)
+
+# 🧹 Eviction frees space down to this share of max_bytes, so the next scan is many writes away
+EVICT_TARGET_RATIO = 0.9
+
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+# 🔑 Builds a content-addressed cache key by hashing all parts that influence the result
+def make_cache_key(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")    # Separator so ("ab", "c") and ("a", "bc") differ
+    return digest.hexdigest()
+
+
+# 🗄️ On-disk JSON cache with a size limit (least recently used entries evicted first) and a TTL
+class DiskCache:
+
+    def __init__(self, directory, max_bytes=100 * 1024 * 1024, ttl_seconds=30 * 24 * 3600, name="cache"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._size = None           # Bytes on disk, known after the first scan and then tracked per write
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    # 📁 Entries are sharded by the first two hex characters to keep directories small
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    # 🔍 Returns the cached value for a key, or None when missing or expired
+    def get(self, key):
+        path = self._path(key)
+
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+
+            # ⌛ Expired entries are removed on read
+            if self.ttl_seconds and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+                self._remove(path)
+                self.misses += 1
+                return None
+
+            # 🕐 Touch the file so its mtime reflects the last access (used for LRU eviction)
+            os.utime(path, None)
+            self.hits += 1
+            return entry.get("value")
+
+    # 💾 Stores a JSON-serialisable value under a key; the directory is only scanned for eviction on the first
+    # write and once the tracked size goes over the limit, not on every write
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"created_at": time.time(), "value": value}
+
+        with self._lock:
+            # Write to a temp file first so readers never see a half-written entry
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+
+            replaced = self._file_size(path)
+            os.replace(temp_path, path)
+
+            if self._size is not None:
+                self._size += self._file_size(path) - replaced
+            if self._size is None or self._size > self.max_bytes:
+                self._evict()
+
+    # 🗑️ Removes a single entry; returns True if something was deleted
+    def invalidate(self, key):
+        with self._lock:
+            return self._remove(self._path(key))
+
+    # 📊 Hit/miss counters for logging
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def _file_size(self, path):
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _remove(self, path):
+        size = self._file_size(path)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+
+        if self._size is not None:
+            self._size -= size
+        return True
+
+    # 🧹 Drops expired entries, then (once over max_bytes) least recently used ones until the cache is back
+    # under EVICT_TARGET_RATIO of it; the scan also resets the tracked size (other processes may share the directory)
+    def _evict(self):
+        self._size = None
+        entries = []
+        total_size = 0
+        now = time.time()
+
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+                # mtime is refreshed on every hit, so it doubles as "last used";
+                # an entry untouched for longer than the TTL is necessarily expired
+                if self.ttl_seconds and now - stat.st_mtime > self.ttl_seconds:
+                    self._remove(path)
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        if total_size > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_bytes * EVICT_TARGET_RATIO:
+                    break
+                if self._remove(path):
+                    total_size -= size
+
+        self._size = total_size
+
+
+# 🧠 Returns the process-wide cache shared by the website and audio GPT summarizers
+def get_summary_cache():
+    global _summary_cache
+
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = DiskCache(
+                SUMMARY_CACHE_DIR,
+                max_bytes=SUMMARY_CACHE_MAX_MB * 1024 * 1024,
+                ttl_seconds=SUMMARY_CACHE_TTL_DAYS * 24 * 3600,
+                name="summaries",
+            )
+        return _summary_cache
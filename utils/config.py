@@ -0,0 +1,35 @@
+# 📦 Standard Libraries
+import os
+
+# 🌐 Third-Party Libraries
+from dotenv import load_dotenv
+
+# 🔐 .env is read exactly once per process, the first time any module imports this config
+load_dotenv()
+
+# ✅ Values accepted as "on" for boolean flags
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+# 🔤 String setting; unset or empty values fall back to the default
+def env_str(name, default=None):
+    value = os.environ.get(name)
+    return value if value not in (None, "") else default
+
+
+# 🔢 Integer setting
+def env_int(name, default=None):
+    value = env_str(name)
+    return int(value) if value is not None else default
+
+
+# 🔢 Float setting
+def env_float(name, default=None):
+    value = env_str(name)
+    return float(value) if value is not None else default
+
+
+# ✅ Boolean flag ("1", "true", "yes" or "on")
+def env_bool(name, default=False):
+    value = env_str(name)
+    return value.strip().lower() in TRUE_VALUES if value is not None else default
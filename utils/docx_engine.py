@@ -0,0 +1,96 @@
+# 📦 Standard Libraries
+import io
+import re
+import copy
+import threading
+
+from utils.config import env_str
+
+# 🎨 Branded .docx template every report starts from (unset = python-docx's built-in template)
+DOCX_TEMPLATE_PATH = env_str("DOCX_TEMPLATE_PATH")
+
+# 📄 MIME type of Word documents
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# 🔠 Splits a line into plain text and **bold** spans (compiled once, not per line)
+BOLD_PATTERN = re.compile(r"(\*\*.*?\*\*)")
+
+_template = None
+_template_lock = threading.Lock()
+_style_ids = {}
+
+
+# 🎨 Parses the template package once per process; every document is cloned from it
+def _get_template():
+    global _template
+
+    with _template_lock:
+        if _template is None:
+            from docx import Document
+            _template = Document(DOCX_TEMPLATE_PATH) if DOCX_TEMPLATE_PATH else Document()
+        return _template
+
+
+# 📄 New document cloned in memory from the cached template (no zip read or XML parse per document)
+def new_document():
+    template = _get_template()
+    with _template_lock:
+        return copy.deepcopy(template)
+
+
+# 🎨 Paragraph style ID for a style name, looked up in the template once per process
+# (python-docx re-scans every style on each `style=` assignment, which dominated rendering time).
+# None means the default paragraph style, which is also used when the template lacks the style.
+def _get_style_id(name):
+    template = _get_template()
+
+    with _template_lock:
+        if name not in _style_ids:
+            from docx.enum.style import WD_STYLE_TYPE
+            try:
+                style = template.styles[name]
+                _style_ids[name] = template.part.get_style_id(style, WD_STYLE_TYPE.PARAGRAPH)
+            except KeyError:
+                _style_ids[name] = None
+        return _style_ids[name]
+
+
+# 🏗️ Builds one report on a template clone
+class ReportBuilder:
+
+    def __init__(self):
+        self.doc = new_document()
+
+    # ➕ Appends a paragraph and sets its style ID directly
+    def _add(self, text, style):
+        para = self.doc.add_paragraph(text)
+        style_id = _get_style_id(style) if style else None
+        if style_id:
+            para._p.get_or_add_pPr().style = style_id
+        return para
+
+    # 📌 Level 0 is the document title, 1–9 are section headings
+    def heading(self, text, level=1):
+        return self._add(text, "Title" if level == 0 else f"Heading {level}")
+
+    def paragraph(self, text="", style=None):
+        return self._add(text, style)
+
+    # ➤ Bullet point; **bold** spans become bold runs
+    def bullet(self, text):
+        para = self._add("", "List Bullet")
+        for part in BOLD_PATTERN.split(text):
+            if not part:
+                continue
+            if part.startswith("**") and part.endswith("**") and len(part) > 3:
+                para.add_run(part[2:-2]).bold = True
+            else:
+                para.add_run(part)
+        return para
+
+    # 💾 Saves into a single buffer, rewound and ready to hand to the uploader as-is
+    def to_buffer(self):
+        buffer = io.BytesIO()
+        self.doc.save(buffer)
+        buffer.seek(0)
+        return buffer
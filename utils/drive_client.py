@@ -0,0 +1,125 @@
+# 📦 Standard Libraries
+import os
+import pickle
+import datetime
+import threading
+
+from utils.config import env_str, env_int
+
+# 🐢 Google auth and googleapiclient are imported inside the functions below, so runs that never
+# touch Drive (e.g. a watch poll with nothing pending) do not pay for loading them
+
+# 🛠 OAuth2 credential and token paths (set via .env)
+CREDENTIALS_PATH = env_str("GOOGLE_OAUTH_FILE")
+TOKEN_PATH = env_str("GOOGLE_TOKEN_FILE")
+SCOPES = ["https://www.googleapis.com/auth/drive.file"]
+
+# ⏱️ Refresh the access token this long before it expires, so no request ever hits a 401 first
+REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+# 🌐 Socket timeout for Drive HTTP connections (seconds)
+DRIVE_HTTP_TIMEOUT = env_int("DRIVE_HTTP_TIMEOUT", 120)
+
+_lock = threading.RLock()
+_credentials = None
+_discovery_document = None
+
+# 🧵 googleapiclient/httplib2 objects are not thread-safe: each thread keeps its own client,
+# and each client keeps its own persistent (keep-alive) connection to the Drive API
+_thread_local = threading.local()
+
+
+# 📄 Loads the Drive v3 discovery document once per process (bundled with googleapiclient, no network)
+def _get_discovery_document():
+    global _discovery_document
+
+    with _lock:
+        if _discovery_document is None:
+            try:
+                from googleapiclient.discovery_cache import get_static_doc
+                _discovery_document = get_static_doc("drive", "v3")
+            except ImportError:
+                _discovery_document = None
+
+            # Older googleapiclient releases ship no static documents; fetch it once and keep it
+            if not _discovery_document:
+                from googleapiclient.discovery import build
+                service = build("drive", "v3", developerKey="discovery", cache_discovery=False)
+                _discovery_document = service._rootDesc
+
+        return _discovery_document
+
+
+# 🔐 Loads, refreshes or creates the shared OAuth credentials (thread-safe)
+def get_credentials():
+    global _credentials
+
+    with _lock:
+        creds = _credentials
+
+        # ✅ Load cached credentials (token.pickle) once per process
+        if creds is None and TOKEN_PATH and os.path.exists(TOKEN_PATH):
+            with open(TOKEN_PATH, "rb") as token:
+                creds = pickle.load(token)
+
+        # 🔄 Refresh proactively when the token is missing, invalid or about to expire
+        expiring = bool(
+            creds
+            and creds.expiry
+            and creds.expiry - datetime.datetime.utcnow() < REFRESH_MARGIN
+        )
+
+        if not creds or not creds.valid or expiring:
+            if creds and creds.refresh_token:
+                from google.auth.transport.requests import Request
+                creds.refresh(Request())
+
+            # Launch a browser-based login flow
+            else:
+                if not CREDENTIALS_PATH:
+                    raise ValueError("⚠️ GOOGLE_OAUTH_FILE not set in .env")
+
+                from google_auth_oauthlib.flow import InstalledAppFlow
+                flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
+                creds = flow.run_local_server(port=0)
+
+            # 💾 Save the new token to disk
+            if TOKEN_PATH:
+                with open(TOKEN_PATH, "wb") as token:
+                    pickle.dump(creds, token)
+
+        _credentials = creds
+        return creds
+
+
+# 📡 Returns this thread's Drive client, authenticated via API key or OAuth
+def get_drive_service(api_key=None):
+    import httplib2
+    from googleapiclient.discovery import build_from_document
+
+    services = getattr(_thread_local, "services", None)
+    if services is None:
+        services = _thread_local.services = {}
+
+    # 🔑 API-key clients never expire and are reused as-is
+    if api_key:
+        service = services.get(("api_key", api_key))
+        if service is None:
+            service = build_from_document(
+                _get_discovery_document(),
+                developerKey=api_key,
+                http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT),
+            )
+            services[("api_key", api_key)] = service
+        return service
+
+    # 🔐 OAuth clients share one credentials object that is refreshed before it expires
+    creds = get_credentials()
+    service = services.get("oauth")
+    if service is None or service._http.credentials is not creds:
+        from google_auth_httplib2 import AuthorizedHttp
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT))
+        service = build_from_document(_get_discovery_document(), http=http)
+        services["oauth"] = service
+
+    return service
@@ -0,0 +1,217 @@
+# 📦 Standard Libraries
+import time
+import hashlib
+import zipfile
+import threading
+
+from utils.config import env_float
+from utils import drive_client
+
+# ⏱️ How often (seconds) a cached output-folder listing picks up files changed by other runs
+UPLOAD_LISTING_REFRESH_SECONDS = env_float("UPLOAD_LISTING_REFRESH_SECONDS", 300)
+
+# ⏱️ A lookup miss re-checks Drive at most this often (seconds), so a file another run just created is reused
+UPLOAD_LISTING_MISS_REFRESH_SECONDS = 30
+
+# 🏷️ appProperties stored on every uploaded file (private to this app, invisible in the Drive UI)
+KEY_PROPERTY = "fmsKey"                 # Hash of the deterministic document key
+HASH_PROPERTY = "fmsContentHash"        # Hash of the document content
+
+# 🧾 File fields kept in the listing cache
+FILE_FIELDS = "id, name, modifiedTime, appProperties"
+
+_listings = {}
+_listings_lock = threading.Lock()
+
+
+# 🔑 Short, fixed-length ID for a document key (appProperties allow only 124 bytes per key + value)
+def key_id(key):
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+# 🔒 Content hash of a document stream. For .docx (zip) packages it covers member names and uncompressed
+# bytes only, because python-docx stamps the current time on every zip entry when saving
+def content_hash(stream):
+    digest = hashlib.sha256()
+    stream.seek(0)
+
+    if zipfile.is_zipfile(stream):
+        stream.seek(0)
+        with zipfile.ZipFile(stream) as package:
+            for member in sorted(package.namelist()):
+                digest.update(member.encode("utf-8") + b"\0")
+                digest.update(package.read(member))
+    else:
+        stream.seek(0)
+        digest.update(stream.read())
+
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+# 🔎 True if a Drive file still exists and is not in the trash (the folder listing only learns about
+# new and changed files, never about deleted ones)
+def file_exists(file_id, api_key=None):
+    from googleapiclient.errors import HttpError
+
+    service = drive_client.get_drive_service(api_key)
+    try:
+        file = service.files().get(fileId=file_id, fields="id, trashed").execute()
+    except HttpError as e:
+        if e.resp.status == 404:
+            return False
+        raise
+    return not file.get("trashed")
+
+
+# 🗂️ Cached listing of one output folder, indexed by document key (and by name for files uploaded before keys)
+class FolderListing:
+
+    def __init__(self, folder_id, api_key=None):
+        self.folder_id = folder_id
+        self.api_key = api_key
+        self.by_key = {}                # key_id -> file
+        self.by_name = {}               # name -> unkeyed legacy file (newest wins among duplicates)
+        self.last_modified = None       # Newest modifiedTime seen (RFC 3339, sortable as text)
+        self.last_refresh = 0.0
+        self._lock = threading.RLock()
+
+    # 📄 Lists the folder's files with full pagination, optionally only those modified after a timestamp
+    def _list_files(self, modified_after=None):
+        service = drive_client.get_drive_service(self.api_key)
+        query = f"'{self.folder_id}' in parents and trashed = false"
+        if modified_after:
+            query += f" and modifiedTime > '{modified_after}'"
+
+        files = []
+        page_token = None
+        while True:
+            response = service.files().list(
+                q=query,
+                fields=f"nextPageToken, files({FILE_FIELDS})",
+                pageSize=1000,
+                pageToken=page_token,
+            ).execute()
+            files.extend(response.get("files", []))
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return files
+
+    # ➕ Adds or replaces a file in the cache (of several legacy files with the same name, the newest is used)
+    def remember(self, file):
+        with self._lock:
+            key = (file.get("appProperties") or {}).get(KEY_PROPERTY)
+            if key:
+                self.by_key[key] = file
+                if self.by_name.get(file["name"], {}).get("id") == file["id"]:
+                    del self.by_name[file["name"]]      # A legacy file that has now been adopted
+            else:
+                current = self.by_name.get(file["name"])
+                if not current or (file.get("modifiedTime") or "") >= (current.get("modifiedTime") or ""):
+                    self.by_name[file["name"]] = file
+
+            modified = file.get("modifiedTime")
+            if modified and (not self.last_modified or modified > self.last_modified):
+                self.last_modified = modified
+
+    # 🗑️ Drops a file that turned out to be deleted or trashed
+    def forget(self, file):
+        with self._lock:
+            for index in (self.by_key, self.by_name):
+                for name, cached in list(index.items()):
+                    if cached["id"] == file["id"]:
+                        del index[name]
+
+    # 🔄 Full listing on first use, then only files created or changed since the newest one seen
+    def refresh(self):
+        with self._lock:
+            first = self.last_refresh == 0.0
+            changed = self._list_files(modified_after=None if first else self.last_modified)
+            for file in changed:
+                self.remember(file)
+
+            self.last_refresh = time.time()
+            if first:
+                print(f"🗂️ Listed {len(changed)} file(s) in output folder {self.folder_id}")
+
+    # 🔍 Existing file for a document key, or (if `name` is given) a legacy file with that name;
+    # refreshes when the listing is stale or on a miss
+    def find(self, key, name=None):
+        with self._lock:
+            if time.time() - self.last_refresh > UPLOAD_LISTING_REFRESH_SECONDS:
+                self.refresh()
+
+            file = self.by_key.get(key) or self.by_name.get(name)
+            if file is None and time.time() - self.last_refresh > UPLOAD_LISTING_MISS_REFRESH_SECONDS:
+                self.refresh()
+                file = self.by_key.get(key) or self.by_name.get(name)
+            return file
+
+
+# 🗂️ Returns the shared listing of an output folder (listed on first use, reused for the whole run)
+def get_folder_listing(folder_id, api_key=None):
+    key = (folder_id, api_key)
+
+    with _listings_lock:
+        if key not in _listings:
+            _listings[key] = FolderListing(folder_id, api_key=api_key)
+        return _listings[key]
+
+
+# 📤 Uploads a document idempotently: skipped if unchanged, updated in place if changed, created otherwise.
+# Returns the Drive file ID. `key` identifies the document across runs; without one the name is the key,
+# and a legacy file with the same name is adopted (with an explicit key, same-named files may be other documents)
+def upload_document(stream, folder_id, name, mime_type, key=None, target_mime_type=None, api_key=None):
+    from googleapiclient.errors import HttpError
+    from googleapiclient.http import MediaIoBaseUpload
+
+    service = drive_client.get_drive_service(api_key)
+    listing = get_folder_listing(folder_id, api_key=api_key)
+
+    document_key = key_id(key or name)
+    digest = content_hash(stream)
+    properties = {KEY_PROPERTY: document_key, HASH_PROPERTY: digest}
+    existing = listing.find(document_key, None if key else name)
+
+    # ⏭️ Same content as the file already in Drive: nothing to send, once the file is confirmed to still exist
+    if existing and (existing.get("appProperties") or {}).get(HASH_PROPERTY) == digest:
+        if file_exists(existing["id"], api_key=api_key):
+            print(f"⏭️ Unchanged, upload skipped: {name} ({existing['id']})")
+            return existing["id"]
+
+        # 🗑️ Deleted or trashed since it was listed: create a new file below
+        listing.forget(existing)
+        existing = None
+
+    media = MediaIoBaseUpload(stream, mimetype=mime_type, resumable=True)
+
+    # 🔁 Changed content replaces the existing file's content (same ID and link, no duplicate)
+    if existing:
+        try:
+            uploaded = service.files().update(
+                fileId=existing["id"],
+                body={"name": name, "appProperties": properties},
+                media_body=media,
+                fields=FILE_FIELDS,
+            ).execute()
+            listing.remember(uploaded)
+            print(f"🔁 Updated in place: {name} ({uploaded['id']})")
+            return uploaded["id"]
+
+        # 🗑️ Deleted since it was listed: fall through and create a new file
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            listing.forget(existing)
+            stream.seek(0)
+            media = MediaIoBaseUpload(stream, mimetype=mime_type, resumable=True)
+
+    body = {"name": name, "parents": [folder_id], "appProperties": properties}
+    if target_mime_type:
+        body["mimeType"] = target_mime_type     # e.g. convert to a Google Doc on upload
+
+    uploaded = service.files().create(body=body, media_body=media, fields=FILE_FIELDS).execute()
+    listing.remember(uploaded)
+    print(f"📤 Uploaded: {name} ({uploaded['id']})")
+    return uploaded["id"]
@@ -0,0 +1,104 @@
+# 📦 Standard Libraries
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from utils.cache import make_cache_key
+from utils.config import env_str
+
+
+# 🗃️ Location of the SQLite job ledger (override in .env)
+JOB_LEDGER_PATH = env_str("JOB_LEDGER_PATH", os.path.join(".cache", "ledger.sqlite3"))
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+# 🪪 Identity of a sheet row that survives rows being inserted or re-ordered
+def row_key(meeting_date, company_name):
+    return make_cache_key("row", meeting_date.strip().lower(), company_name.strip().lower())
+
+
+# 🌐 Identity of a website across rows, so later meetings with the same client can reuse its summary
+def site_key(normalized_url):
+    return make_cache_key("site", normalized_url)
+
+
+# 🔑 Fingerprint of the inputs a stage depends on
+def fingerprint(*parts):
+    return make_cache_key(*parts)
+
+
+# 📒 Persistent per-row record of completed stages, so an interrupted row resumes where it stopped
+class JobLedger:
+
+    def __init__(self, path=JOB_LEDGER_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stages (
+                row_key     TEXT NOT NULL,
+                stage       TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                output      TEXT NOT NULL,
+                updated_at  REAL NOT NULL,
+                PRIMARY KEY (row_key, stage)
+            )
+            """
+        )
+        self._connection.commit()
+
+    # 🔍 Returns the stored output of a stage, or None if missing or produced from different inputs
+    def get(self, key, stage, stage_fingerprint):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, output FROM stages WHERE row_key = ? AND stage = ?",
+                (key, stage),
+            ).fetchone()
+
+        if row and row[0] == stage_fingerprint:
+            return json.loads(row[1])
+        return None
+
+    # 💾 Records the output of a completed stage (replaces any previous attempt)
+    def put(self, key, stage, stage_fingerprint, output):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO stages (row_key, stage, fingerprint, output, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (key, stage, stage_fingerprint, json.dumps(output, ensure_ascii=False), time.time()),
+            )
+            self._connection.commit()
+
+    # ⏭️ Returns the recorded output of a stage, or runs compute() and records its result
+    def resume(self, key, stage, stage_fingerprint, compute, label=""):
+        output = self.get(key, stage, stage_fingerprint)
+        if output is not None:
+            print(f"⏭️ {label}{stage} resumed from ledger.")
+            return output
+
+        output = compute()
+        if output is not None:
+            self.put(key, stage, stage_fingerprint, output)
+        return output
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+# 📒 Returns the process-wide job ledger
+def get_ledger():
+    global _ledger
+
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = JobLedger()
+        return _ledger
@@ -0,0 +1,214 @@
+# 📦 Standard Libraries
+import os
+import json
+import math
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+
+from utils.config import env_str
+
+# 🗂️ Where stage samples are appended (JSON lines) and where the Prometheus textfile is written (override in .env)
+METRICS_JSONL_PATH = env_str("METRICS_JSONL_PATH", os.path.join(".cache", "metrics", "stages.jsonl"))
+METRICS_PROM_PATH = env_str("METRICS_PROM_PATH", os.path.join(".cache", "metrics", "fms_summarizer.prom"))
+
+# 📐 Percentiles printed in the run summary and exported to Prometheus
+PERCENTILES = (50, 90, 99)
+
+_metrics = None
+_metrics_lock = threading.Lock()
+_local = threading.local()
+
+
+# 📏 Nearest-rank percentile of an already sorted list
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+# 🪪 Tags every sample recorded on this thread with a sheet row until the block exits
+@contextmanager
+def bind_row(row_index):
+    previous = getattr(_local, "row", None)
+    _local.row = row_index
+    try:
+        yield
+    finally:
+        _local.row = previous
+
+
+# 🧮 Adds tokens to the innermost open span on this thread (called by the OpenAI gateway)
+def add_tokens(count):
+    spans = getattr(_local, "spans", None)
+    if spans and count:
+        spans[-1]["tokens"] = spans[-1].get("tokens", 0) + count
+
+
+# 📊 Collects one sample per stage execution: duration, bytes, tokens and outcome, tagged with the row
+class MetricsRecorder:
+
+    def __init__(self, jsonl_path=METRICS_JSONL_PATH, prom_path=METRICS_PROM_PATH):
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self._lock = threading.Lock()
+        self._file = None
+        self.start_run()
+
+    # 🆕 Starts a new run: samples and the summary start from zero; the JSON-lines file keeps growing
+    def start_run(self):
+        with self._lock:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.started = time.time()
+            self.samples = []
+
+    # 📝 Records one finished stage execution
+    def record(self, stage, duration=0.0, outcome="ok", row=None, bytes=None, tokens=None, **extra):
+        sample = {
+            "run_id": self.run_id,
+            "ts": round(time.time(), 3),
+            "stage": stage,
+            "row": row if row is not None else getattr(_local, "row", None),
+            "duration": round(duration, 4),
+            "outcome": outcome,
+        }
+        if bytes is not None:
+            sample["bytes"] = int(bytes)
+        if tokens is not None:
+            sample["tokens"] = int(tokens)
+        sample.update(extra)
+
+        with self._lock:
+            self.samples.append(sample)
+            self._append_jsonl(sample)
+        return sample
+
+    def _append_jsonl(self, sample):
+        if not self.jsonl_path:
+            return
+        try:
+            if self._file is None:
+                directory = os.path.dirname(self.jsonl_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.jsonl_path, "a", encoding="utf-8", buffering=1)
+            self._file.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not write metrics to {self.jsonl_path}: {e}")
+            self.jsonl_path = None
+
+    # ⏱️ Times a block; the yielded dict accepts "bytes" and "tokens" (and any extra fields) from the caller
+    @contextmanager
+    def span(self, stage, row=None):
+        fields = {}
+        spans = getattr(_local, "spans", None)
+        if spans is None:
+            spans = _local.spans = []
+        spans.append(fields)
+
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield fields
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            spans.pop()
+            self.record(stage, time.perf_counter() - started, outcome, row=row, **fields)
+
+    # 📈 Per-stage aggregates of the current run
+    def summary(self):
+        with self._lock:
+            samples = list(self.samples)
+
+        stages = {}
+        for sample in samples:
+            stages.setdefault(sample["stage"], []).append(sample)
+
+        summary = {}
+        for stage, stage_samples in stages.items():
+            durations = sorted(sample["duration"] for sample in stage_samples)
+            summary[stage] = {
+                "count": len(stage_samples),
+                "errors": sum(1 for sample in stage_samples if sample["outcome"] != "ok"),
+                "seconds": round(sum(durations), 3),
+                "max": durations[-1],
+                "bytes": sum(sample.get("bytes", 0) for sample in stage_samples),
+                "tokens": sum(sample.get("tokens", 0) for sample in stage_samples),
+                **{f"p{pct}": percentile(durations, pct) for pct in PERCENTILES},
+            }
+        return summary
+
+    # 🖨️ Prints the per-stage table (sorted by total time, so the bottleneck comes first)
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return summary
+
+        print(f"⏱️ Stage timings for run {self.run_id} ({round(time.time() - self.started, 1)}s wall clock):")
+        print(f"   {'stage':<14}{'count':>6}{'errors':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'total':>10}")
+        for stage, stats in sorted(summary.items(), key=lambda item: -item[1]["seconds"]):
+            line = (
+                f"   {stage:<14}{stats['count']:>6}{stats['errors']:>7}"
+                f"{stats['p50']:>8.2f}s{stats['p90']:>8.2f}s{stats['p99']:>8.2f}s{stats['max']:>8.2f}s{stats['seconds']:>9.1f}s"
+            )
+            if stats["bytes"]:
+                line += f"  {round(stats['bytes'] / 1024 / 1024, 1)}MB"
+            if stats["tokens"]:
+                line += f"  {stats['tokens']} tok"
+            print(line)
+        return summary
+
+    # 📤 Writes the run summary in Prometheus text format (atomically, for node_exporter's textfile collector)
+    def write_prometheus(self, path=None, extra_gauges=None):
+        path = path or self.prom_path
+        if not path:
+            return None
+
+        summary = self.summary()
+        lines = [
+            "# HELP fms_stage_duration_seconds Stage duration per row in the last run.",
+            "# TYPE fms_stage_duration_seconds summary",
+        ]
+        for stage, stats in summary.items():
+            for pct in PERCENTILES:
+                lines.append(f'fms_stage_duration_seconds{{stage="{stage}",quantile="{pct / 100}"}} {stats[f"p{pct}"]}')
+            lines.append(f'fms_stage_duration_seconds_sum{{stage="{stage}"}} {stats["seconds"]}')
+            lines.append(f'fms_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+
+        for metric, key, help_text in (
+            ("fms_stage_errors", "errors", "Failed stage executions in the last run."),
+            ("fms_stage_bytes", "bytes", "Bytes moved by each stage in the last run."),
+            ("fms_stage_tokens", "tokens", "OpenAI tokens used by each stage in the last run."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for stage, stats in summary.items():
+                lines.append(f'{metric}{{stage="{stage}"}} {stats[key]}')
+
+        gauges = {"fms_run_timestamp_seconds": round(self.started, 3), **(extra_gauges or {})}
+        for metric, value in gauges.items():
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as prom_file:
+            prom_file.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+        return path
+
+
+# 📊 Returns the process-wide metrics recorder
+def get_metrics():
+    global _metrics
+
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRecorder()
+        return _metrics
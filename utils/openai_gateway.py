@@ -0,0 +1,355 @@
+# 📦 Standard Libraries
+import time
+import random
+import asyncio
+import threading
+
+from utils.config import env_str, env_int, env_float
+from utils.tokens import count_tokens
+from utils import metrics
+
+# 🚦 Account budgets shared by every caller in the process (override in .env to match your OpenAI tier)
+OPENAI_RPM = env_int("OPENAI_RPM", 500)
+OPENAI_TPM = env_int("OPENAI_TPM", 200000)
+OPENAI_AUDIO_RPM = env_int("OPENAI_AUDIO_RPM", 50)
+
+# 🧵 Upper bound for requests in flight; the adaptive limit moves between 1 and this value
+OPENAI_MAX_CONCURRENCY = env_int("OPENAI_MAX_CONCURRENCY", 8)
+
+# 🔁 Retries for throttling and transient errors, and the chat request timeout (seconds)
+OPENAI_MAX_RETRIES = env_int("OPENAI_MAX_RETRIES", 5)
+OPENAI_REQUEST_TIMEOUT = env_float("OPENAI_REQUEST_TIMEOUT", 120)
+
+# 🧮 Completion tokens reserved per chat request when the caller sets no max_tokens
+EXPECTED_COMPLETION_TOKENS = 1500
+
+# ⏱️ Concurrency is halved at most once per this many seconds, so one burst of 429s counts as one signal
+DECREASE_COOLDOWN_SECONDS = 2.0
+
+_gateway = None
+_gateway_lock = threading.Lock()
+_openai = None
+
+
+# 🐢 Imports the openai SDK (and aiohttp with it) on first use and applies the API key
+def get_openai():
+    global _openai
+
+    if _openai is None:
+        import openai
+        openai.api_key = env_str("OPENAI_KEY")
+        _openai = openai
+    return _openai
+
+
+# 🪣 Token bucket refilled continuously; reservations may go into debt and return how long to wait
+class TokenBucket:
+
+    def __init__(self, per_minute):
+        self.capacity = max(1, per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    # ⏳ Takes `amount` from the bucket and returns the seconds to wait until the reservation is covered
+    def reserve(self, amount):
+        with self._lock:
+            self._refill()
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self.rate)
+
+    # ↩️ Corrects a reservation once the real cost is known (negative amounts charge the difference)
+    def refund(self, amount):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+# 📈 Concurrency limit that grows by one per window of successes and halves on throttling (AIMD)
+class AdaptiveLimiter:
+
+    def __init__(self, max_limit):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def _try_acquire(self):
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self):
+        with self._condition:
+            while not self._try_acquire():
+                self._condition.wait()
+
+    # Async callers poll instead of blocking the event loop on the condition
+    async def acquire_async(self):
+        while True:
+            with self._condition:
+                if self._try_acquire():
+                    return
+            await asyncio.sleep(0.05)
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    # ➕ Additive increase: about +1 after `limit` consecutive successes
+    def on_success(self):
+        with self._condition:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._condition.notify()
+
+    # ➗ Multiplicative decrease on throttling
+    def on_throttle(self):
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease >= DECREASE_COOLDOWN_SECONDS:
+                self.limit = max(1.0, self.limit / 2)
+                self._last_decrease = now
+
+
+# ⏳ Seconds the server asked us to wait (Retry-After / retry-after-ms), or None
+def _retry_after(error):
+    headers = getattr(error, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+# 🚦 Throttling that is worth waiting out (an exhausted quota is not)
+def _is_throttle(error):
+    openai = get_openai()
+    return isinstance(error, openai.error.RateLimitError) and getattr(error, "code", None) != "insufficient_quota"
+
+
+# 🔁 Transient failures worth retrying
+def _is_transient(error):
+    openai = get_openai()
+    if isinstance(error, (openai.error.ServiceUnavailableError, openai.error.APIConnectionError,
+                          openai.error.Timeout, openai.error.TryAgain)):
+        return True
+    if isinstance(error, openai.error.APIError):
+        return (error.http_status or 500) >= 500
+    return False
+
+
+# 🧮 Rough prompt size of a chat request plus the completion budget, used for the TPM reservation
+def estimate_chat_tokens(params):
+    prompt_tokens = sum(count_tokens(message.get("content") or "") + 4 for message in params.get("messages", []))
+    return prompt_tokens + (params.get("max_tokens") or EXPECTED_COMPLETION_TOKENS)
+
+
+# 🚪 Single entry point for OpenAI calls: shared RPM/TPM budgets, Retry-After, adaptive concurrency
+class OpenAIGateway:
+
+    def __init__(self, rpm=None, tpm=None, audio_rpm=None, max_concurrency=None, max_retries=None):
+        self.buckets = {
+            "requests": TokenBucket(rpm or OPENAI_RPM),
+            "tokens": TokenBucket(tpm or OPENAI_TPM),
+            "audio": TokenBucket(audio_rpm or OPENAI_AUDIO_RPM),
+        }
+        self.limiter = AdaptiveLimiter(max_concurrency or OPENAI_MAX_CONCURRENCY)
+        self.max_retries = OPENAI_MAX_RETRIES if max_retries is None else max_retries
+
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._counters = {
+            "requests": 0,
+            "throttled": 0,
+            "retries": 0,
+            "failures": 0,
+            "tokens_used": 0,
+            "wait_seconds": 0.0,
+        }
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+
+    # 📊 Counters for logs and metrics
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["queue_depth"] = self._queue_depth
+            stats["max_queue_depth"] = self._max_queue_depth
+        stats["in_flight"] = self.limiter.in_flight
+        stats["concurrency_limit"] = int(self.limiter.limit)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 1)
+        return stats
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _queue(self, delta):
+        with self._lock:
+            self._queue_depth += delta
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+
+    # ⏳ Reserves budget for one request; returns how long to wait before sending it
+    def _admission_delay(self, kind, estimated_tokens):
+        if kind == "audio":
+            delay = self.buckets["audio"].reserve(1)
+        else:
+            delay = max(
+                self.buckets["requests"].reserve(1),
+                self.buckets["tokens"].reserve(estimated_tokens),
+            )
+
+        # A Retry-After from any caller pauses everyone, not just the request that got the 429
+        with self._lock:
+            delay = max(delay, self._paused_until - time.monotonic())
+            self._counters["wait_seconds"] += max(0.0, delay)
+        return max(0.0, delay)
+
+    # ✅ Records a success and corrects the TPM reservation with the real usage
+    def _on_success(self, kind, estimated_tokens, response):
+        self.limiter.on_success()
+        self._count("requests")
+
+        if kind == "chat":
+            usage = (response.get("usage") or {}) if hasattr(response, "get") else {}
+            used = usage.get("total_tokens")
+            if used:
+                self.buckets["tokens"].refund(estimated_tokens - used)
+                self._count("tokens_used", used)
+                metrics.add_tokens(used)
+
+    # ❌ Classifies a failure; returns the seconds to wait before retrying, or None to give up
+    def _on_error(self, error, attempt):
+        throttled = _is_throttle(error)
+        if attempt > self.max_retries or not (throttled or _is_transient(error)):
+            self._count("failures")
+            return None
+
+        self._count("retries")
+        delay = _retry_after(error)
+
+        if throttled:
+            self._count("throttled")
+            self.limiter.on_throttle()
+
+        if delay is None:
+            delay = min(60.0, 2 ** attempt) * random.uniform(0.5, 1.0)
+
+        if throttled:
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+        print(f"⚠️ OpenAI {type(error).__name__} (attempt {attempt}/{self.max_retries}) — retrying in {round(delay, 1)}s")
+        return delay
+
+    # 🔁 Sends a request through the budgets and limiter, retrying throttling and transient errors
+    def _execute(self, kind, estimated_tokens, send):
+        attempt = 0
+        while True:
+            attempt += 1
+            self._queue(1)
+            try:
+                time.sleep(self._admission_delay(kind, estimated_tokens))
+                self.limiter.acquire()
+            finally:
+                self._queue(-1)
+
+            try:
+                response = send()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = None
+            finally:
+                self.limiter.release()
+
+            # 😴 The backoff happens after the concurrency slot is released, so a failed request never holds it
+            # while healthy requests wait
+            if delay is not None:
+                time.sleep(delay)
+                continue
+
+            self._on_success(kind, estimated_tokens, response)
+            return response
+
+    # 🔁 Async twin of _execute: same budgets, counters and limiter, shared with threaded callers
+    async def _execute_async(self, kind, estimated_tokens, send):
+        attempt = 0
+        while True:
+            attempt += 1
+            self._queue(1)
+            try:
+                await asyncio.sleep(self._admission_delay(kind, estimated_tokens))
+                await self.limiter.acquire_async()
+            finally:
+                self._queue(-1)
+
+            try:
+                response = await send()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = None
+            finally:
+                self.limiter.release()
+
+            # 😴 The backoff happens after the concurrency slot is released, so a failed request never holds it
+            # while healthy requests wait
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+
+            self._on_success(kind, estimated_tokens, response)
+            return response
+
+    # 🤖 openai.ChatCompletion.create through the gateway
+    def chat_completion(self, **params):
+        params.setdefault("request_timeout", OPENAI_REQUEST_TIMEOUT)
+        return self._execute("chat", estimate_chat_tokens(params), lambda: get_openai().ChatCompletion.create(**params))
+
+    async def achat_completion(self, **params):
+        params.setdefault("request_timeout", OPENAI_REQUEST_TIMEOUT)
+        return await self._execute_async(
+            "chat", estimate_chat_tokens(params), lambda: get_openai().ChatCompletion.acreate(**params)
+        )
+
+    # 🎧 openai.Audio.transcribe through the gateway (the file is reopened for every attempt)
+    def transcribe(self, audio_path, **params):
+        def send():
+            with open(audio_path, "rb") as audio_file:
+                return get_openai().Audio.transcribe(file=audio_file, **params)
+
+        return self._execute("audio", 0, send)
+
+    async def atranscribe(self, audio_path, **params):
+        async def send():
+            with open(audio_path, "rb") as audio_file:
+                return await get_openai().Audio.atranscribe(file=audio_file, **params)
+
+        return await self._execute_async("audio", 0, send)
+
+
+# 🚪 Returns the process-wide OpenAI gateway
+def get_gateway():
+    global _gateway
+
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = OpenAIGateway()
+        return _gateway
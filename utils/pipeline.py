@@ -0,0 +1,128 @@
+# 📦 Standard Libraries
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from utils.config import env_str
+from utils.metrics import get_metrics
+
+# 🚦 Pipeline stages in the order a row flows through them
+STAGES = ("fetch", "summarize", "preprocess", "transcribe", "render", "upload")
+
+# ⚙️ Default concurrency limit per stage (override with PIPELINE_<STAGE>_WORKERS in .env)
+DEFAULT_STAGE_LIMITS = {
+    "fetch": 4,         # Website extraction + audio lookup/download (network bound)
+    "summarize": 4,     # GPT calls
+    "preprocess": 2,    # ffmpeg speech transcode (CPU bound)
+    "transcribe": 2,    # Whisper uploads (large request bodies)
+    "render": 2,        # DOCX generation (CPU bound)
+    "upload": 4,        # Drive uploads
+}
+
+# 🧮 How many rows may be worked on at the same time (override with PIPELINE_ROWS_IN_FLIGHT)
+DEFAULT_ROWS_IN_FLIGHT = 3
+
+
+# ⚙️ Reads per-stage concurrency limits from the environment, falling back to the defaults
+def load_stage_limits():
+    limits = {}
+    for stage in STAGES:
+        value = env_str(f"PIPELINE_{stage.upper()}_WORKERS")
+        limits[stage] = max(1, int(value)) if value else DEFAULT_STAGE_LIMITS[stage]
+    return limits
+
+
+# 🏭 Runs sheet rows either strictly one after another or as a bounded, staged pipeline
+class StagedPipeline:
+
+    def __init__(self, concurrent=False, stage_limits=None, rows_in_flight=None):
+        self.concurrent = concurrent
+        self.stage_limits = stage_limits or load_stage_limits()
+
+        env_rows = env_str("PIPELINE_ROWS_IN_FLIGHT")
+        self.rows_in_flight = max(1, rows_in_flight or (int(env_rows) if env_rows else DEFAULT_ROWS_IN_FLIGHT))
+
+        # 🎟️ One semaphore per stage bounds how many rows can be inside that stage at once
+        self._stage_slots = {
+            stage: threading.BoundedSemaphore(limit)
+            for stage, limit in self.stage_limits.items()
+        }
+        self._branch_pool = None
+
+    # 🚦 Context manager that holds a slot of the given stage while the body runs and times it.
+    # `metric` names the measured step when several steps share a stage (e.g. "download" in "fetch");
+    # the yielded dict takes "bytes" and other fields for the metrics sample.
+    @contextmanager
+    def stage(self, name, metric=None):
+        if not self.concurrent:
+            with get_metrics().span(metric or name) as span:
+                yield span
+            return
+
+        queued = time.perf_counter()
+        with self._stage_slots[name]:
+            with get_metrics().span(metric or name) as span:
+                span["wait"] = round(time.perf_counter() - queued, 4)
+                yield span
+
+    # 🔀 Runs the branches of a single row (e.g. website + audio) and returns their results in order
+    def run_branches(self, *branches):
+        if not self.concurrent or len(branches) < 2:
+            return [branch() for branch in branches]
+
+        # The first branch runs on the calling thread, the rest on the shared branch pool
+        futures = [self._branch_pool.submit(branch) for branch in branches[1:]]
+        results = [branches[0]()]
+        results.extend(future.result() for future in futures)
+        return results
+
+    # 🚀 Processes every job with process(job, pipeline) and commits results in the original job order
+    def run(self, jobs, process, commit):
+        if not self.concurrent:
+            committed = 0
+            for job in jobs:
+                if commit(job, self._process_isolated(process, job)):
+                    committed += 1
+            return committed
+
+        print(
+            f"🏭 Pipeline mode: {self.rows_in_flight} row(s) in flight, stage limits "
+            + ", ".join(f"{stage}={limit}" for stage, limit in self.stage_limits.items())
+        )
+
+        committed = 0
+        window = deque()    # Bounded queue of submitted rows, oldest first
+        max_queued = self.rows_in_flight * 2
+
+        with ThreadPoolExecutor(max_workers=self.rows_in_flight, thread_name_prefix="row") as row_pool, \
+                ThreadPoolExecutor(max_workers=self.rows_in_flight, thread_name_prefix="branch") as branch_pool:
+            self._branch_pool = branch_pool
+
+            for job in jobs:
+                window.append((job, row_pool.submit(self._process_isolated, process, job)))
+
+                # ⏳ Apply back-pressure: wait for the oldest row before queueing more
+                if len(window) >= max_queued:
+                    committed += self._commit_oldest(window, commit)
+
+            while window:
+                committed += self._commit_oldest(window, commit)
+
+        self._branch_pool = None
+        return committed
+
+    # ✅ Waits for the oldest queued row and commits it (keeps sheet writes in row order)
+    def _commit_oldest(self, window, commit):
+        job, future = window.popleft()
+        return 1 if commit(job, future.result()) else 0
+
+    # 🛡️ Runs one job so that an unexpected error only affects that row
+    def _process_isolated(self, process, job):
+        try:
+            return process(job, self)
+
+        except Exception as e:
+            print(f"❌ Row {job.get('row_index')} failed unexpectedly: {e}")
+            return None
@@ -1,35 +1,165 @@
 # 📦 Standard Libraries
-import os
+import time
+import atexit
+import threading
 
-# 🌐 Third-Party Libraries
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from dotenv import load_dotenv
+from utils.config import env_str, env_int, env_float
+from utils.metrics import get_metrics
 
-# 🔐 Load environment variables from .env
-load_dotenv()
 
 # Google Sheet ID and service account key path from .env
-SHEET_ID = os.getenv("GOOGLE_SHEET_ID")        # Unique identifier of the Google Sheet
-CREDENTIALS_PATH = os.getenv("GOOGLE_SA_FILE") # Path to the service account credentials JSON
+SHEET_ID = env_str("GOOGLE_SHEET_ID")        # Unique identifier of the Google Sheet
+CREDENTIALS_PATH = env_str("GOOGLE_SA_FILE") # Path to the service account credentials JSON
+
+# 📝 Write-behind settings: buffered cell updates are flushed every N rows or every N seconds
+SHEET_FLUSH_ROWS = env_int("SHEET_FLUSH_ROWS", 10)
+SHEET_FLUSH_SECONDS = env_float("SHEET_FLUSH_SECONDS", 30)
+
+# Required Google API scopes for the service account
+SCOPES = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+_sheet = None
+_sheet_lock = threading.Lock()
+_writer = None
+
+
+# 🔐 Returns the job worksheet, authorizing the service account only once per process
+def get_sheet():
+    global _sheet
+
+    with _sheet_lock:
+        if _sheet is None:
+            # 🐢 gspread and oauth2client take ~0.5s to import, so they load on first sheet access
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+
+            creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, SCOPES)
+            client = gspread.authorize(creds)
+            _sheet = client.open_by_key(SHEET_ID).sheet1
+        return _sheet
+
+
+# 🕐 Drive modifiedTime of the job spreadsheet, or None if it cannot be read
+def get_sheet_modified_time():
+    spreadsheet = get_sheet().spreadsheet
+
+    # Older gspread versions have no live lookup; callers then fall back to comparing row hashes
+    if not hasattr(spreadsheet, "get_lastUpdateTime"):
+        return None
+
+    try:
+        return spreadsheet.get_lastUpdateTime()
+    except Exception:
+        return None
+
+
+# 📝 Buffers cell updates and writes them with a single batch_update per flush
+class SheetWriter:
+
+    def __init__(self, sheet=None, flush_rows=SHEET_FLUSH_ROWS, flush_seconds=SHEET_FLUSH_SECONDS):
+        self._sheet = sheet
+        self.flush_rows = max(1, flush_rows)
+        self.flush_seconds = flush_seconds
+        self._pending = []              # [(row, col, value)] in the order they were queued
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer = None
+        self._listeners = []            # Called with the row numbers of every successful flush
+
+        # ⏲️ Background thread flushes on the time interval even when few rows arrive
+        if flush_seconds and flush_seconds > 0:
+            self._timer = threading.Thread(target=self._flush_periodically, name="sheet-writer", daemon=True)
+            self._timer.start()
+
+    # ✏️ Queues a single cell update
+    def queue_cell(self, row, col, value):
+        self.queue_cells(row, {col: value})
+
+    # ✏️ Queues several cells of one row together; flushes when enough distinct rows are buffered
+    def queue_cells(self, row, cells):
+        with self._lock:
+            self._pending.extend((row, col, value) for col, value in cells.items())
+            buffered_rows = len({r for r, _, _ in self._pending})
+
+        if buffered_rows >= self.flush_rows:
+            try:
+                self.flush()
+            except Exception:
+                pass    # Already logged; the updates stay buffered for the next flush
+
+    # 🔔 Registers a callback(row_numbers) that runs after each successful flush
+    def add_flush_listener(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    # 🚀 Writes every buffered update in one batch_update call; failed updates stay buffered
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+
+            if not pending:
+                return 0
+
+            from gspread.utils import rowcol_to_a1
+            data = [
+                {"range": rowcol_to_a1(row, col), "values": [[value]]}
+                for row, col, value in pending
+            ]
+
+            try:
+                with get_metrics().span("sheet_write") as span:
+                    span["cells"] = len(pending)
+                    sheet = self._sheet or get_sheet()
+                    sheet.batch_update(data, value_input_option="USER_ENTERED")    # Formulas like HYPERLINK are evaluated
+
+            except Exception as e:
+                print(f"❌ Sheet batch update failed ({len(pending)} cell(s) kept for retry): {e}")
+                with self._lock:
+                    self._pending = pending + self._pending
+                raise
+
+            print(f"📝 Sheet updated: {len(pending)} cell(s) in one batch.")
+
+            rows = sorted({row for row, _, _ in pending})
+            for callback in self._listeners:
+                callback(rows)
+            return len(pending)
+
+    # 🛑 Stops the background timer and writes anything still buffered
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception:
+                pass    # Already logged; the updates stay buffered for the next attempt
+
+
+# 📝 Returns the process-wide sheet writer (flushed automatically at interpreter exit)
+def get_sheet_writer():
+    global _writer
+
+    with _sheet_lock:
+        if _writer is None:
+            _writer = SheetWriter()
+            atexit.register(_writer.close)
+        return _writer
 
 
 # 📥 Get all rows that are pending processing
 def get_pending_rows():
 
-    # Define the required Google API scopes
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    
-    # 🔐 Authenticate using the service account
-    creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, scope)
-    client = gspread.authorize(creds)
-    
-    # Open the first worksheet in the specified sheet
-    sheet = client.open_by_key(SHEET_ID).sheet1
+    # Open the first worksheet in the specified sheet (shared authorized client)
+    sheet = get_sheet()
     records = sheet.get_all_values()
 
     # 🟡 Filter for rows that have both website and audio links and are not marked "done"
@@ -46,34 +176,19 @@ def get_pending_rows():
     return pending
 
 
-# 📤 Update a row in the Google Sheet with summary links and status
+# 📤 Queue a row's summary links and status; written with the next batched flush
 def update_sheet_with_links( row_index, meeting_url=None, meeting_name=None, website_url=None, website_name=None):
-    
-    # Define the required scopes
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-
-    # 🔐 Authenticate again for sheet update
-    creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, scope)
-    client = gspread.authorize(creds)
-    sheet = client.open_by_key(SHEET_ID).sheet1
-    wrote_something = False
+    cells = {}
     
     # ✏️ Insert meeting (audio) summary hyperlink into column 7 (G)
     if meeting_url and meeting_name:
-        formula = f'=HYPERLINK("{meeting_url}", "{meeting_name}")'
-        sheet.update_cell(row_index, 7, formula)
-        wrote_something = True
+        cells[7] = f'=HYPERLINK("{meeting_url}", "{meeting_name}")'
     
     # ✏️ Insert website summary hyperlink into column 8 (H)
     if website_url and website_name:
-        formula = f'=HYPERLINK("{website_url}", "{website_name}")'
-        sheet.update_cell(row_index, 8, formula)
-        wrote_something = True
+        cells[8] = f'=HYPERLINK("{website_url}", "{website_name}")'
     
     # ✅ Mark the row as done if any link was updated
-    if wrote_something:
-        sheet.update_cell(row_index, 9, "Done")
\ No newline at end of file
+    if cells:
+        cells[9] = "Done"
+        get_sheet_writer().queue_cells(row_index, cells)
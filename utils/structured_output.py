@@ -0,0 +1,370 @@
+# 📦 Standard Libraries
+import re
+import json
+import threading
+
+from utils.config import env_int
+from utils.openai_gateway import get_gateway
+
+# 🔁 Follow-up requests for sections that are still missing or invalid after local repair
+STRUCTURED_MAX_REASKS = env_int("STRUCTURED_MAX_REASKS", 1)
+
+# 🧹 Markdown code fences around a JSON reply
+FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+
+# 🧹 Trailing commas before a closing bracket ({"a": 1,} / [1, 2,])
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+# 🔧 Typographic quotes GPT sometimes uses as JSON delimiters
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+# 💬 Follow-up message asking for the failed sections only
+REASK_PROMPT = """
+Your previous answer was missing these sections, or they were empty or malformed: {names}.
+Return **only valid JSON** with just these sections, using exactly this structure:
+{skeleton}
+"""
+
+_stats = {"responses": 0, "repaired": 0, "reasks": 0, "sections_reasked": 0, "tokens_saved": 0}
+_stats_lock = threading.Lock()
+
+
+# ❌ Raised when a reply holds no usable JSON object, even after repairs and re-asks
+class StructuredOutputError(ValueError):
+    pass
+
+
+# 📊 Counters for logs: responses parsed, local repairs, re-asks and the completion tokens they saved
+def get_structured_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(**amounts):
+    with _stats_lock:
+        for name, amount in amounts.items():
+            _stats[name] += amount
+
+
+# 🧱 The first complete {...} object (string-aware brace matching), or everything from "{" if it never closes
+def _balanced_object(text):
+    start = text.find("{")
+    if start < 0:
+        return text
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+
+    return text[start:]
+
+
+# ✂️ Closes a reply that was cut off mid-way (max_tokens): open string, dangling key, open brackets
+def _close_truncated(text):
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    if text.endswith(":"):
+        text += " null"
+    return text + "".join(reversed(stack))
+
+
+# 🩹 (candidate text, repaired) from least to most invasive; fences and surrounding prose only locate the JSON
+def _candidates(text):
+    text = text.strip()
+    yield text, False
+
+    fenced = FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+        yield text, False
+
+    text = _balanced_object(text)
+    yield text, False
+
+    text = TRAILING_COMMA_PATTERN.sub(r"\1", text)
+    yield text, True
+
+    text = TRAILING_COMMA_PATTERN.sub(r"\1", text.translate(SMART_QUOTES))
+    yield text, True
+
+    yield TRAILING_COMMA_PATTERN.sub(r"\1", _close_truncated(text)), True
+
+
+# 🔍 Parses the JSON object in a reply; returns (object, repaired) where repaired means a fix was needed
+# beyond locating the JSON (trailing commas, smart quotes, raw newlines in strings, truncation)
+def parse_json(text):
+    for candidate, repaired in _candidates(text or ""):
+        for strict in (True, False):        # strict=False accepts raw control characters inside strings
+            try:
+                value = json.loads(candidate, strict=strict)
+            except ValueError:
+                continue
+            if isinstance(value, dict):
+                return value, repaired or not strict
+
+    raise StructuredOutputError("Response did not contain a valid JSON object.")
+
+
+# 📝 Turns a value into a list of bullet strings; None if it has the wrong type
+def _as_bullets(value):
+    if isinstance(value, str):
+        lines = (line.strip().lstrip("-•*").strip() for line in value.splitlines())
+        return [line for line in lines if line]
+    if isinstance(value, list):
+        items = (item if isinstance(item, str) else json.dumps(item, ensure_ascii=False) for item in value)
+        return [item.strip() for item in items if item and item.strip()]
+    return None
+
+
+# 🗂️ Schema whose sections are lists of bullet strings at (dotted) key paths, e.g. "action_plan.decision_made".
+# Empty lists are valid; missing keys and wrong types are not.
+class KeyedListSchema:
+
+    def __init__(self, name, paths):
+        self.name = name
+        self.sections = tuple(paths)
+
+    def _get(self, data, path):
+        for key in path.split("."):
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+        return data
+
+    def _set(self, document, path, value):
+        *parents, last = path.split(".")
+        for key in parents:
+            document = document.setdefault(key, {})
+        document[last] = value
+
+    # ✅ Returns (clean document, names of missing or invalid sections)
+    def normalize(self, data):
+        document = {}
+        invalid = []
+        for path in self.sections:
+            items = _as_bullets(self._get(data, path))
+            if items is None:
+                invalid.append(path)
+            self._set(document, path, items or [])
+        return document, invalid
+
+    # 🧩 JSON example containing only the given sections
+    def skeleton(self, names):
+        example = {}
+        for path in names:
+            self._set(example, path, ["..."])
+        return json.dumps(example, indent=2)
+
+    # 🔗 Copies the given sections from a re-asked reply; returns the sections that are still invalid
+    def merge(self, document, patch, names):
+        patched, patch_invalid = self.normalize(patch)
+        for path in names:
+            if path not in patch_invalid:
+                self._set(document, path, self._get(patched, path))
+        return [path for path in names if path in patch_invalid]
+
+    # 🕳️ Sections that could not be recovered stay empty
+    def fill(self, document, names):
+        return document
+
+
+# 🗂️ Schema of {"title": ..., "sections": [{"heading": ..., "content": "- bullet\n- bullet"}]};
+# every expected heading needs non-empty content (matched case- and punctuation-insensitively)
+class HeadingSectionsSchema:
+
+    def __init__(self, name, headings, placeholder="- No information available."):
+        self.name = name
+        self.sections = tuple(headings)
+        self.placeholder = placeholder
+
+    def _slug(self, heading):
+        return re.sub(r"[^a-z0-9]+", "", str(heading).lower())
+
+    # 📄 {slug: (heading, content)} from the sections GPT returned (list of objects or a heading → content map)
+    def _found(self, data):
+        sections = data.get("sections") if isinstance(data, dict) else None
+        if isinstance(sections, dict):
+            sections = [{"heading": heading, "content": content} for heading, content in sections.items()]
+
+        found = {}
+        for section in sections if isinstance(sections, list) else []:
+            if not isinstance(section, dict) or not section.get("heading"):
+                continue
+            content = section.get("content")
+            if isinstance(content, list):
+                content = "\n".join(f"- {item}" for item in _as_bullets(content))
+            found[self._slug(section["heading"])] = (str(section["heading"]), content if isinstance(content, str) else "")
+        return found
+
+    # ✅ Returns (clean document in schema order, headings that are missing or empty); extra sections are kept last
+    def normalize(self, data):
+        found = self._found(data)
+        title = data.get("title") if isinstance(data, dict) and isinstance(data.get("title"), str) else ""
+
+        sections = []
+        invalid = []
+        for heading in self.sections:
+            _, content = found.pop(self._slug(heading), (heading, ""))
+            if not content.strip():
+                invalid.append(heading)
+            sections.append({"heading": heading, "content": content.strip()})
+
+        sections.extend({"heading": heading, "content": content.strip()} for heading, content in found.values() if content.strip())
+        return {"title": title, "sections": sections}, invalid
+
+    def skeleton(self, names):
+        return json.dumps(
+            {"sections": [{"heading": heading, "content": "- Bullet point 1\n- Bullet point 2\n..."} for heading in names]},
+            indent=2,
+        )
+
+    def merge(self, document, patch, names):
+        found = self._found(patch)
+        still_invalid = []
+        for section in document["sections"]:
+            if section["heading"] not in names:
+                continue
+            _, content = found.get(self._slug(section["heading"]), ("", ""))
+            if content.strip():
+                section["content"] = content.strip()
+            else:
+                still_invalid.append(section["heading"])
+        return still_invalid
+
+    def fill(self, document, names):
+        for section in document["sections"]:
+            if section["heading"] in names:
+                section["content"] = self.placeholder
+        return document
+
+
+# 🧾 Reply text and completion tokens of a chat response (the prompt is sent again by any retry, so only
+# the generated tokens count towards savings)
+def _reply(response):
+    usage = (response.get("usage") or {}) if hasattr(response, "get") else {}
+    return response["choices"][0]["message"]["content"] or "", usage.get("completion_tokens") or 0
+
+
+# 🔍 Parses and validates a reply; returns (document or None, invalid sections)
+def _validate(schema, text, tokens):
+    _count(responses=1)
+    try:
+        data, repaired = parse_json(text)
+    except StructuredOutputError:
+        print(f"⚠️ {schema.name}: no valid JSON in the reply; asking again.")
+        return None, list(schema.sections)
+
+    # 🩹 A local repair replaces what would otherwise have been a full retry of the request
+    if repaired:
+        _count(repaired=1, tokens_saved=tokens)
+        print(f"🩹 {schema.name}: malformed JSON repaired locally (~{tokens} completion token(s) saved).")
+
+    return schema.normalize(data)
+
+
+# 💬 The original conversation, GPT's previous reply and a request for the failed sections only
+def _reask_messages(schema, messages, reply, invalid):
+    names = ", ".join(invalid)
+    return messages + [
+        {"role": "assistant", "content": reply},
+        {"role": "user", "content": REASK_PROMPT.format(names=names, skeleton=schema.skeleton(invalid))},
+    ]
+
+
+# 🔗 Applies a re-asked reply; returns (document, still invalid)
+def _apply_reask(schema, document, invalid, text, tokens, first_tokens):
+    partial = document is not None
+    try:
+        patch, _ = parse_json(text)
+    except StructuredOutputError:
+        return document, invalid
+
+    if not partial:
+        return schema.normalize(patch)
+
+    still_invalid = schema.merge(document, patch, invalid)
+
+    # 💰 Completion tokens not regenerated for the sections that were already valid
+    saved = max(0, first_tokens - tokens)
+    _count(tokens_saved=saved)
+    print(f"🎯 {schema.name}: re-asked {len(invalid)} section(s) instead of the full prompt (~{saved} completion token(s) saved).")
+    return document, still_invalid
+
+
+# 🏁 Gives up on a reply without JSON, or fills the sections that are still invalid
+def _finish(schema, document, invalid):
+    if document is None:
+        raise StructuredOutputError(f"{schema.name}: GPT returned no valid JSON after {STRUCTURED_MAX_REASKS} re-ask(s).")
+    if invalid:
+        print(f"⚠️ {schema.name}: {len(invalid)} section(s) could not be recovered: {', '.join(invalid)}")
+        schema.fill(document, invalid)
+    return document
+
+
+# 🤖 Chat completion whose reply is validated against a schema: malformed JSON is repaired locally and
+# only missing or invalid sections are requested again
+def complete_structured(schema, messages, **params):
+    gateway = get_gateway()
+    text, first_tokens = _reply(gateway.chat_completion(messages=messages, **params))
+    document, invalid = _validate(schema, text, first_tokens)
+
+    for _ in range(STRUCTURED_MAX_REASKS):
+        if not invalid:
+            break
+        _count(reasks=1, sections_reasked=len(invalid))
+        text, tokens = _reply(gateway.chat_completion(messages=_reask_messages(schema, messages, text, invalid), **params))
+        document, invalid = _apply_reask(schema, document, invalid, text, tokens, first_tokens)
+
+    return _finish(schema, document, invalid)
+
+
+# 🤖 Async twin of complete_structured
+async def acomplete_structured(schema, messages, **params):
+    gateway = get_gateway()
+    text, first_tokens = _reply(await gateway.achat_completion(messages=messages, **params))
+    document, invalid = _validate(schema, text, first_tokens)
+
+    for _ in range(STRUCTURED_MAX_REASKS):
+        if not invalid:
+            break
+        _count(reasks=1, sections_reasked=len(invalid))
+        text, tokens = _reply(await gateway.achat_completion(messages=_reask_messages(schema, messages, text, invalid), **params))
+        document, invalid = _apply_reask(schema, document, invalid, text, tokens, first_tokens)
+
+    return _finish(schema, document, invalid)
@@ -0,0 +1,91 @@
+# 📦 Standard Libraries
+import threading
+
+# 🔤 Tokenizer used by the GPT-4.1 family
+ENCODING_NAME = "o200k_base"
+
+# 📏 Fallback estimate when tiktoken (or its encoding file) is unavailable: ~4 characters per token
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+# 🔤 Loads the tiktoken encoding once; returns None if tiktoken is missing or cannot load it offline
+def _get_encoding():
+    global _encoding, _encoding_loaded
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(ENCODING_NAME)
+            except Exception as e:
+                print(f"⚠️ tiktoken unavailable ({type(e).__name__}); estimating tokens from text length.")
+                _encoding = None
+            _encoding_loaded = True
+
+        return _encoding
+
+
+# 🔢 Counts (or estimates) the number of tokens in a text
+def count_tokens(text):
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+# ✂️ Hard-splits a single oversized piece of text into pieces of at most max_tokens tokens
+def _split_long_text(text, max_tokens):
+    encoding = _get_encoding()
+    if encoding:
+        token_ids = encoding.encode(text, disallowed_special=())
+        return [
+            encoding.decode(token_ids[i : i + max_tokens])
+            for i in range(0, len(token_ids), max_tokens)
+        ]
+
+    # Without a tokenizer, cut on whitespace near the estimated character limit
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        cut = cut if cut > 0 else max_chars
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip()
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+# 📚 Splits text into chunks of at most max_tokens, keeping whole lines together where possible
+def split_by_tokens(text, max_tokens):
+    chunks = []
+    current_lines = []
+    current_tokens = 0
+
+    for line in text.splitlines():
+        line_tokens = count_tokens(line) + 1    # +1 for the newline that joins lines
+
+        # A single line larger than a whole chunk is split on token boundaries
+        if line_tokens > max_tokens:
+            if current_lines:
+                chunks.append("\n".join(current_lines))
+                current_lines, current_tokens = [], 0
+            chunks.extend(_split_long_text(line, max_tokens))
+            continue
+
+        if current_tokens + line_tokens > max_tokens and current_lines:
+            chunks.append("\n".join(current_lines))
+            current_lines, current_tokens = [], 0
+
+        current_lines.append(line)
+        current_tokens += line_tokens
+
+    if current_lines:
+        chunks.append("\n".join(current_lines))
+
+    return chunks
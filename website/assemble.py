@@ -0,0 +1,154 @@
+# 📦 Standard Libraries
+import re
+import hashlib
+from collections import Counter
+
+from utils.config import env_int
+from utils.tokens import count_tokens
+
+# 💰 Maximum tokens of website text sent to GPT per row (override in .env)
+WEBSITE_TOKEN_BUDGET = env_int("WEBSITE_TOKEN_BUDGET", 12000)
+
+# 🧱 A block seen on at least this share of a site's pages is treated as boilerplate (nav, footer, banner)
+BOILERPLATE_PAGE_SHARE = 0.5
+
+# ✂️ Repeated lines shorter than this are menu items or buttons and are dropped outright;
+# longer ones (taglines, footer addresses) are kept once at a lower priority
+BOILERPLATE_MIN_KEEP_CHARS = 40
+
+# 🔤 Lines are grouped into blocks of roughly this many characters before ranking
+BLOCK_CHARS = 600
+
+# 🎯 Keywords per summary section; blocks mentioning them are packed first
+SECTION_KEYWORDS = {
+    "Purpose": ("mission", "vision", "purpose", "we help", "we believe", "goal"),
+    "Target Audience": ("customers", "clients", "for businesses", "for families", "industries", "who we serve"),
+    "About the Company": ("about", "founded", "since", "our story", "history", "team", "years of experience"),
+    "Company Information": ("address", "phone", "email", "contact", "location", "office", "hours"),
+    "Unique Selling Proposition (USP)": ("why choose", "unique", "only", "best", "award", "certified", "guarantee", "trusted"),
+    "Reviews/Testimonials": ("review", "testimonial", "rated", "stars", "said", "happy", "recommend"),
+    "Products/Service Categories": ("services", "products", "solutions", "we offer", "packages", "categories"),
+    "Offers": ("offer", "discount", "free", "% off", "deal", "promo", "limited time", "pricing", "price"),
+}
+
+# ⚠️ Lines that almost never carry business information
+NOISE_PATTERNS = re.compile(
+    r"(cookie|privacy policy|terms (of|and) (use|service)|all rights reserved|©|copyright|"
+    r"skip to (main )?content|accept all|log ?in|sign ?up|subscribe to our newsletter)",
+    re.IGNORECASE,
+)
+
+
+# 🔑 Hash of a line with case and whitespace normalized
+def _line_hash(line):
+    normalized = re.sub(r"\s+", " ", line.lower()).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+# 🧱 Finds lines repeated on many pages of the same site (menus, footers, cookie banners)
+def find_boilerplate(pages, min_share=BOILERPLATE_PAGE_SHARE):
+    if len(pages) < 2:
+        return set()
+
+    page_counts = Counter()
+    for page in pages:
+        page_counts.update({_line_hash(line) for line in page["text"].splitlines() if line.strip()})
+
+    threshold = max(2, int(len(pages) * min_share + 0.5))
+    return {line_hash for line_hash, count in page_counts.items() if count >= threshold}
+
+
+# 📦 Groups consecutive lines of one page into blocks of about BLOCK_CHARS characters
+def _blocks(lines, max_chars=BLOCK_CHARS):
+    block, size = [], 0
+    for line in lines:
+        if block and size + len(line) > max_chars:
+            yield "\n".join(block)
+            block, size = [], 0
+        block.append(line)
+        size += len(line) + 1
+    if block:
+        yield "\n".join(block)
+
+
+# 🥇 Scores a block by how many section keywords it covers (sections covered count more than repeats)
+def _relevance(block):
+    text = block.lower()
+    sections_hit = 0
+    keyword_hits = 0
+    for keywords in SECTION_KEYWORDS.values():
+        hits = sum(text.count(keyword) for keyword in keywords)
+        if hits:
+            sections_hit += 1
+            keyword_hits += hits
+
+    # Very short blocks (lone menu items, buttons) get a penalty
+    length_factor = min(1.0, len(text) / 200)
+    return (sections_hit * 2 + min(keyword_hits, 10) * 0.5) * length_factor + length_factor * 0.1
+
+
+# 🧩 Builds the GPT input from crawled pages: removes boilerplate and duplicates, ranks and packs blocks
+def assemble_website_text(pages, token_budget=None):
+    token_budget = token_budget or WEBSITE_TOKEN_BUDGET
+    raw_text = "\n\n".join(page["text"] for page in pages if page["text"])
+    raw_tokens = count_tokens(raw_text)
+
+    boilerplate = find_boilerplate(pages)
+    seen_lines = set()
+    site_wide_lines = []
+    blocks = []     # (score, page_order, block_order, text)
+
+    for page_order, page in enumerate(pages):
+        lines = []
+        for line in page["text"].splitlines():
+            line = line.strip()
+            line_hash = _line_hash(line)
+
+            # 🧹 Skip empty lines, duplicates and legal/cookie noise
+            if not line or line_hash in seen_lines:
+                continue
+            if len(line) < 80 and NOISE_PATTERNS.search(line):
+                continue
+            seen_lines.add(line_hash)
+
+            # 🧱 Site-wide boilerplate: drop menus, keep longer repeated lines once (see below)
+            if line_hash in boilerplate:
+                if len(line) >= BOILERPLATE_MIN_KEEP_CHARS:
+                    site_wide_lines.append(line)
+                continue
+
+            lines.append(line)
+
+        for block_order, block in enumerate(_blocks(lines)):
+            # The home page keeps a small bonus: it usually states what the company does
+            score = _relevance(block) + (0.5 if page_order == 0 else 0)
+            blocks.append((score, page_order, block_order, block))
+
+    # 🏷️ Repeated taglines and footer details come last in reading order and rank below page content
+    for block_order, block in enumerate(_blocks(site_wide_lines)):
+        blocks.append((_relevance(block) * 0.5, len(pages), block_order, block))
+
+    # 💰 Greedily pack the best blocks into the token budget
+    selected = []
+    used_tokens = 0
+    for score, page_order, block_order, block in sorted(blocks, key=lambda item: (-item[0], item[1], item[2])):
+        block_tokens = count_tokens(block) + 2
+        if used_tokens + block_tokens > token_budget:
+            continue
+        selected.append((page_order, block_order, block))
+        used_tokens += block_tokens
+
+    # 📖 Restore reading order so GPT sees each page's text as it appears on the site
+    selected.sort()
+    text = "\n\n".join(block for _, _, block in selected)
+
+    stats = {
+        "pages": len(pages),
+        "raw_tokens": raw_tokens,
+        "tokens": count_tokens(text),
+        "boilerplate_lines": len(boilerplate),
+        "blocks_kept": len(selected),
+        "blocks_total": len(blocks),
+    }
+    stats["tokens_saved"] = max(0, stats["raw_tokens"] - stats["tokens"])
+    return text, stats
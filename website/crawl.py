@@ -0,0 +1,213 @@
+# 📦 Standard Libraries
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from utils.config import env_int
+from website.extract import fetch_url, get_session, parse_page_offloaded
+
+# ⚙️ Crawl limits (override in .env); the default of 1 page keeps single-page extraction
+WEBSITE_CRAWL_MAX_PAGES = env_int("WEBSITE_CRAWL_MAX_PAGES", 1)
+WEBSITE_CRAWL_MAX_DEPTH = env_int("WEBSITE_CRAWL_MAX_DEPTH", 2)
+WEBSITE_CRAWL_WORKERS = env_int("WEBSITE_CRAWL_WORKERS", 8)
+
+# 🎯 Pages the summary prompt cares about are fetched first (earlier keywords rank higher)
+PRIORITY_KEYWORDS = (
+    "about", "service", "product", "solution", "testimonial", "review",
+    "offer", "pricing", "package", "why", "team", "contact",
+)
+
+# 🚫 Links that never lead to readable HTML
+SKIPPED_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico", ".zip", ".rar",
+    ".mp3", ".mp4", ".m4a", ".mov", ".avi", ".doc", ".docx", ".xls", ".xlsx", ".ppt",
+    ".pptx", ".css", ".js", ".json", ".xml", ".woff", ".woff2", ".ttf",
+)
+
+# 🧹 Query parameters that only track visitors and never change page content
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid|ref)$", re.IGNORECASE)
+
+
+# 🔗 Normalizes a URL for deduplication (scheme/host case, default ports, fragments, tracking params)
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").lower()
+
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+# 🏠 Host without a leading "www." so that example.com and www.example.com count as one site
+def _site_host(url):
+    host = (urlsplit(url).netloc or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+# ✅ Keeps same-site HTML links only
+def _is_crawlable(url, site_host):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return False
+    if _site_host(url) != site_host:
+        return False
+    return not parts.path.lower().endswith(SKIPPED_EXTENSIONS)
+
+
+# 🥇 Ranks a URL: pages matching the prompt's sections first, then shallower paths
+def _priority(url):
+    path = urlsplit(url).path.lower()
+    for rank, keyword in enumerate(PRIORITY_KEYWORDS):
+        if keyword in path:
+            return (0, rank, path.count("/"), url)
+    return (1, 0, path.count("/"), url)
+
+
+# 🗺️ Reads page URLs from the site's sitemap (robots.txt "Sitemap:" lines or /sitemap.xml)
+def discover_sitemap_urls(start_url, session=None, limit=500):
+    session = session or get_session()
+    parts = urlsplit(start_url)
+    root = f"{parts.scheme}://{parts.netloc}"
+
+    sitemap_urls = []
+    try:
+        robots = fetch_url(f"{root}/robots.txt", session=session)
+        sitemap_urls = [
+            line.split(":", 1)[1].strip()
+            for line in robots.text.splitlines()
+            if line.lower().startswith("sitemap:")
+        ]
+    except Exception:
+        pass
+
+    if not sitemap_urls:
+        sitemap_urls = [f"{root}/sitemap.xml"]
+
+    pages = []
+    pending = list(sitemap_urls)
+    visited = set()
+
+    # 📑 Follow sitemap indexes (bounded, so a huge index cannot stall the crawl)
+    while pending and len(visited) < 10 and len(pages) < limit:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in visited:
+            continue
+        visited.add(sitemap_url)
+
+        try:
+            root_element = ET.fromstring(fetch_url(sitemap_url, session=session).content)
+        except Exception:
+            continue
+
+        is_index = root_element.tag.endswith("sitemapindex")
+        for element in root_element.iter():
+            if element.tag.endswith("loc") and element.text:
+                (pending if is_index else pages).append(element.text.strip())
+
+    return pages[:limit]
+
+
+# 📄 Fetches and parses a single page; returns None for failures and non-HTML responses,
+# except for the start page (`required`), whose failure fails the whole crawl
+def _fetch_page(url, session, required=False):
+    try:
+        response = fetch_url(url, session=session)
+    except Exception as e:
+        if required:
+            raise
+        print(f"⚠️ Skipped {url}: {e}")
+        return None
+
+    content_type = response.headers.get("Content-Type", "text/html")
+    if "html" not in content_type.lower():
+        if required:
+            raise ValueError(f"Start page {url} is not HTML ({content_type}).")
+        return None
+
+    text, links = parse_page_offloaded(response.content, base_url=response.url)
+    return {"url": url, "final_url": response.url, "text": text, "links": links}
+
+
+# 🕸️ Crawls a site breadth-first with bounded concurrency; returns pages in crawl order.
+# Raises if the start page cannot be fetched or no page yields any text, so the row is retried later.
+def crawl_site(start_url, max_pages=None, max_depth=None, workers=None, session=None, use_sitemap=True):
+    max_pages = max(1, max_pages or WEBSITE_CRAWL_MAX_PAGES)
+    max_depth = WEBSITE_CRAWL_MAX_DEPTH if max_depth is None else max_depth
+    workers = max(1, workers or WEBSITE_CRAWL_WORKERS)
+    session = session or get_session()
+
+    start_url = normalize_url(start_url)
+    site_host = _site_host(start_url)
+    seen = {start_url}
+    pages = []
+    level = [start_url]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+
+        # 🗺️ The sitemap is read while the home page is being fetched
+        sitemap_future = pool.submit(discover_sitemap_urls, start_url, session) if use_sitemap and max_pages > 1 else None
+
+        for depth in range(max_depth + 1):
+            if not level or len(pages) >= max_pages:
+                break
+
+            # ⚡ Every page of a level is fetched concurrently, so a level costs about one slow page
+            results = list(pool.map(lambda url: _fetch_page(url, session, required=depth == 0), level))
+
+            candidates = []
+            for page in results:
+                if not page:
+                    continue
+
+                # Redirects can land on an already-crawled page
+                final_url = normalize_url(page["final_url"])
+
+                # The home page may redirect to another host (e.g. a regional domain); follow it
+                if depth == 0:
+                    site_host = _site_host(final_url)
+
+                if final_url != normalize_url(page["url"]) and final_url in seen:
+                    continue
+                seen.add(final_url)
+
+                if len(pages) < max_pages:
+                    pages.append({"url": page["final_url"], "text": page["text"]})
+
+                for link in page["links"]:
+                    link = normalize_url(link)
+                    if link not in seen and _is_crawlable(link, site_host):
+                        candidates.append(link)
+
+            if depth == 0 and sitemap_future:
+                candidates.extend(
+                    normalize_url(url) for url in sitemap_future.result()
+                    if _is_crawlable(normalize_url(url), site_host)
+                )
+
+            # 🎯 Next level: unseen links, best-ranked first, never more than the remaining page budget
+            remaining = max_pages - len(pages)
+            level = []
+            for link in sorted(set(candidates) - seen, key=_priority)[:remaining]:
+                seen.add(link)
+                level.append(link)
+
+    if not any(page["text"].strip() for page in pages):
+        raise ValueError(f"No text could be extracted from {start_url}.")
+
+    print(f"🕸️ Crawled {len(pages)} page(s) from {site_host}")
+    return pages
+
@@ -1,83 +1,26 @@
-# 📦 Standard Libraries
-import os
-import pickle
+# 📡 Shared, cached Drive clients and OAuth credentials
+from utils.config import env_str
+from utils.drive_client import get_drive_service
+from utils.docx_engine import DOCX_MIME_TYPE
+from utils.drive_upload import upload_document
 
-# 🌐 Third-Party Libraries
-from dotenv import load_dotenv
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaInMemoryUpload
 
-# 🔐 Load environment variables from .env
-load_dotenv()
+# 🌐 Drive target folder configuration
+FOLDER_ID = env_str("WEBSITE_DRIVE_FOLDER_ID")                # Destination Drive folder for uploads
 
-# 🌐 OAuth credentials and Drive target folder configuration
-CREDENTIALS_PATH = os.getenv("GOOGLE_OAUTH_FILE")               # Path to OAuth client secrets
-TOKEN_PATH = os.getenv("GOOGLE_TOKEN_FILE")                     # Path to store/load user session token
-FOLDER_ID = os.getenv("WEBSITE_DRIVE_FOLDER_ID")                # Destination Drive folder for uploads
-CLIENT_SECRETS_FILE = CREDENTIALS_PATH                          # Redundant but kept for clarity
-SCOPES = ["https://www.googleapis.com/auth/drive.file"]         # Scope for file upload access
 
-
-# 🔐 Authenticate and return a Google Drive API client using OAuth 2.0
+# 🔐 Return an authorized Google Drive API client (shared OAuth session, reused per thread)
 def authenticate_google_drive():
-    creds = None
-
-    # ✅ Load previously saved token (if available and valid)
-    if TOKEN_PATH and os.path.exists(TOKEN_PATH):
-        with open(TOKEN_PATH, "rb") as token:
-            creds = pickle.load(token)
-
-    # 🔄 Refresh or prompt user login if token is missing or invalid
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        
-        else:
-            if not CREDENTIALS_PATH:
-                raise ValueError("⚠️ GOOGLE_OAUTH_FILE not set in .env")
-            
-            # Launch browser-based login flow
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-            creds = flow.run_local_server(port=0)
+    return get_drive_service()
 
-        # 💾 Save new token for future use
-        if TOKEN_PATH:
-            with open(TOKEN_PATH, "wb") as token:
-                pickle.dump(creds, token)
 
-    # 📡 Return an authorized Drive client
-    return build("drive", "v3", credentials=creds)
-
-
-# 📤 Upload a DOCX file (in memory) to the configured Google Drive folder
+# 📤 Upload a DOCX file (in memory) to the configured folder as a Google Doc; a re-run updates the same
+# document in place (or skips the upload if nothing changed) instead of creating a duplicate
 def upload_docx_to_gdrive(docx_stream, filename):
-    service = authenticate_google_drive()   # Ensure authenticated session
-
-    # 📄 Metadata for the file to be created in Drive
-    file_metadata = {
-        "name": filename,
-        "parents": [FOLDER_ID],
-        "mimeType": "application/vnd.google-apps.document",     # Create as a Google Doc
-    }
-
-    docx_stream.seek(0)
-    docx_content = docx_stream.read()
-
-    # 🗃️ Prepare the file content for upload
-    media = MediaInMemoryUpload(
-        docx_content,
-        mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        resumable=True,
+    return upload_document(
+        docx_stream,
+        FOLDER_ID,
+        filename,
+        mime_type=DOCX_MIME_TYPE,
+        target_mime_type="application/vnd.google-apps.document",     # Create as a Google Doc
     )
-
-    # 🚀 Upload the file and return its ID
-    uploaded = (
-        service.files()
-        .create(body=file_metadata, media_body=media, fields="id, name")
-        .execute()
-    )
-
-    print(f"Uploaded to Google Drive as: {uploaded['name']} (ID: {uploaded['id']})")
-    return uploaded["id"]
\ No newline at end of file
@@ -1,25 +1,243 @@
-import requests
-from bs4 import BeautifulSoup
+# 📦 Standard Libraries
+import re
+import threading
+from urllib.parse import urljoin
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
+from utils.config import env_str, env_int, env_float
+from website.http_cache import get_http_cache
 
-# 🌐 Extracts clean, readable text content from a web page (URL)
-def extract_text_from_url(url):
-    # 🔗 Send an HTTP GET request to the target URL
-    response = requests.get(url)
+# ⏱️ Connect/read timeout for website requests (seconds)
+WEBSITE_HTTP_TIMEOUT = env_float("WEBSITE_HTTP_TIMEOUT", 15)
+
+# 🔌 Connections kept open per host (should be at least the crawler's worker count)
+WEBSITE_POOL_SIZE = env_int("WEBSITE_POOL_SIZE", 16)
+
+# 🪪 Some sites block the default python-requests user agent
+USER_AGENT = "Mozilla/5.0 (compatible; FMSAutoSummarizer/1.0)"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+# 🔌 Returns a shared HTTP session whose connection pool is reused across pages of the same host
+def get_session():
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=WEBSITE_POOL_SIZE, pool_maxsize=WEBSITE_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            _session = session
+        return _session
+
+
+# 🔗 Fetches a URL with a strict timeout and returns the response; pages seen before are revalidated with
+# If-None-Match / If-Modified-Since, and a 304 is answered from the on-disk HTTP cache
+def fetch_url(url, session=None, timeout=None):
+    session = session or get_session()
+    cache = get_http_cache()
+    entry, headers = cache.conditional_headers(url) if cache else (None, {})
+
+    response = session.get(url, timeout=timeout or WEBSITE_HTTP_TIMEOUT, headers=headers)
+    if response.status_code == 304 and entry:
+        return cache.replay(entry, response)
+
+    response.raise_for_status()
+    if cache:
+        cache.save(url, response, entry)
+    return response
+
+
+# 🚫 Subtrees that never hold page copy; pruned while parsing (links inside them are still collected)
+PRUNED_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object", "embed",
+    "nav", "select", "button",
+})
+
+# 🔤 Inline elements: their text continues the surrounding line instead of starting a new one
+INLINE_TAGS = frozenset({
+    "a", "abbr", "b", "bdi", "bdo", "cite", "code", "data", "dfn", "em", "font", "i", "kbd", "label",
+    "mark", "q", "s", "samp", "small", "span", "strong", "sub", "sup", "time", "u", "var", "wbr",
+})
+
+# 🔍 Looks for a declared charset near the top of the document
+CHARSET_PATTERN = re.compile(rb"<meta[^>]+charset", re.IGNORECASE)
+
+# 🧩 HTML parser: "auto" uses lxml when installed and falls back to BeautifulSoup's html.parser
+WEBSITE_PARSER = (env_str("WEBSITE_PARSER", "auto") or "auto").lower()
+
+# 🧮 Worker processes for parsing large pages off the I/O threads (0 parses in the calling thread)
+WEBSITE_PARSE_PROCESSES = env_int("WEBSITE_PARSE_PROCESSES", 2)
+
+# 📏 Smaller pages are parsed in the calling thread; shipping them to a worker costs more than parsing them
+WEBSITE_PARSE_OFFLOAD_BYTES = env_int("WEBSITE_PARSE_OFFLOAD_BYTES", 256 * 1024)
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+# 🧵 lxml parser target: receives start/end/data events straight from libxml2 and keeps only visible text,
+# so no element tree is ever built and pruned subtrees are dropped the moment they are entered
+class _TextCollector:
+
+    def __init__(self):
+        self.lines = []
+        self.links = []
+        self._buffer = []
+        self._skip_depth = 0
+
+    # ✂️ Ends the current line: whitespace inside a block is collapsed the way a browser renders it
+    def _flush(self):
+        if self._buffer:
+            line = " ".join("".join(self._buffer).split())
+            if line:
+                self.lines.append(line)
+            self._buffer = []
+
+    def start(self, tag, attrib):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag == "a" and attrib.get("href"):
+            self.links.append(attrib["href"])
+
+        if self._skip_depth:
+            self._skip_depth += 1
+        elif tag in PRUNED_TAGS:
+            self._skip_depth = 1
+        elif tag not in INLINE_TAGS:
+            self._flush()
+
+    def end(self, tag):
+        if self._skip_depth:
+            self._skip_depth -= 1
+        elif not isinstance(tag, str) or tag.lower() not in INLINE_TAGS:
+            self._flush()
+
+    def data(self, text):
+        if not self._skip_depth:
+            self._buffer.append(text)
+
+    def comment(self, text):
+        pass
 
-    # 🧽 Parse the HTML content using BeautifulSoup
-    soup = BeautifulSoup(response.content, "html.parser")
+    def close(self):
+        self._flush()
+        return self.lines, self.links
 
-    # 🚫 Remove unwanted script and style elements to avoid clutter
-    for script in soup(["script", "style"]):
-        script.decompose()
+
+# ⚡ C-backed parse with lxml (libxml2), pruning as it goes
+def _parse_with_lxml(html):
+    from lxml import etree
+
+    # Without a declared charset libxml2 assumes Latin-1; pages without one are almost always UTF-8
+    encoding = None
+    if isinstance(html, bytes) and not CHARSET_PATTERN.search(html[:4096]):
+        encoding = "utf-8"
+
+    if not html or not html.strip():
+        return [], []
+
+    parser = etree.HTMLParser(target=_TextCollector(), encoding=encoding, recover=True, no_network=True)
+    return etree.fromstring(html, parser)
+
+
+# 🐢 Pure-Python fallback with BeautifulSoup's html.parser
+def _parse_with_bs4(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 🔗 Collect links before the tree is modified
+    links = [anchor["href"] for anchor in soup.find_all("a", href=True)]
+
+    # 🚫 Remove non-content elements to avoid clutter
+    for element in soup(list(PRUNED_TAGS)):
+        element.decompose()
 
     # 📃 Extract visible text from the page with newlines separating blocks
     text = soup.get_text(separator="\n")
 
     # 🧹 Strip whitespace from each line and remove empty lines
     lines = [line.strip() for line in text.splitlines()]
-    cleaned_text = "\n".join(line for line in lines if line)
+    return [line for line in lines if line], links
+
+
+# 🧩 Parser backends by name
+PARSERS = {
+    "lxml": _parse_with_lxml,
+    "bs4": _parse_with_bs4,
+}
+
+
+# 🧩 Picks the configured parser; "auto" prefers lxml and falls back to bs4 when lxml is not installed
+def _get_parser():
+    if WEBSITE_PARSER in PARSERS and WEBSITE_PARSER != "lxml":
+        return PARSERS[WEBSITE_PARSER]
+
+    try:
+        import lxml.etree  # noqa: F401
+        return _parse_with_lxml
+    except ImportError:
+        if WEBSITE_PARSER == "lxml":
+            print("⚠️ WEBSITE_PARSER=lxml but lxml is not installed; using BeautifulSoup.")
+        return _parse_with_bs4
+
+
+# 🧽 Parses HTML once and returns (clean visible text, absolute link URLs)
+def parse_page(html, base_url=None):
+    lines, hrefs = _get_parser()(html)
+
+    links = [urljoin(base_url, href) for href in hrefs] if base_url else []
+    return "\n".join(lines), links
+
+
+# 🏭 Shared worker pool for parsing (spawned, so workers never inherit the crawler's threads or locks)
+def _get_parse_pool():
+    global _parse_pool
+
+    with _parse_pool_lock:
+        if _parse_pool is None and WEBSITE_PARSE_PROCESSES > 0:
+            import multiprocessing
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=WEBSITE_PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parse_pool
+
+
+# 🏭 parse_page in a worker process for large pages, so CPU-heavy parsing never holds the GIL
+# that downloads, uploads and API calls on other threads need; small pages are parsed in place
+def parse_page_offloaded(html, base_url=None):
+    global _parse_pool
+
+    pool = _get_parse_pool() if len(html or b"") >= WEBSITE_PARSE_OFFLOAD_BYTES else None
+    if pool is None:
+        return parse_page(html, base_url)
+
+    try:
+        return pool.submit(parse_page, html, base_url).result()
+
+    # 💥 A crashed worker breaks the pool; start a fresh one next time and parse this page here
+    except BrokenProcessPool as e:
+        print(f"⚠️ Parser worker failed ({e}); parsing in-process.")
+        with _parse_pool_lock:
+            if _parse_pool is pool:
+                _parse_pool = None
+        return parse_page(html, base_url)
+
+
+# 🌐 Extracts clean, readable text content from a web page (URL)
+def extract_text_from_url(url, session=None):
+    # 🔗 Send an HTTP GET request to the target URL
+    response = fetch_url(url, session=session)
 
     # 🧾 Return the fully cleaned body text
-    return cleaned_text
+    text, _ = parse_page_offloaded(response.content)
+    return text
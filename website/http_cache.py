@@ -0,0 +1,101 @@
+# 📦 Standard Libraries
+import os
+import base64
+import threading
+
+from utils.cache import DiskCache, make_cache_key
+from utils.config import env_str, env_int, env_float, env_bool
+
+# ⚙️ On-disk HTTP cache for website pages (override in .env)
+WEBSITE_HTTP_CACHE = env_bool("WEBSITE_HTTP_CACHE", True)
+HTTP_CACHE_DIR = env_str("HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+HTTP_CACHE_MAX_MB = env_int("HTTP_CACHE_MAX_MB", 200)
+HTTP_CACHE_TTL_DAYS = env_float("HTTP_CACHE_TTL_DAYS", 30)
+
+# 🧾 Response headers kept with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# 🗄️ Stores page bodies with their ETag / Last-Modified and revalidates them with conditional requests
+class HttpCache:
+
+    def __init__(self, store):
+        self.store = store
+        self.revalidated = 0        # 304 Not Modified: body served from disk
+        self.refetched = 0          # Cached, but the server sent a new body
+        self._lock = threading.Lock()
+
+    def _key(self, url):
+        return make_cache_key("http", url)
+
+    # 📨 Returns (cached entry or None, headers for a conditional GET)
+    def conditional_headers(self, url):
+        entry = self.store.get(self._key(url))
+        if not entry:
+            return None, {}
+
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return entry, headers
+
+    # 💾 Keeps a 200 response that carries a validator (without one it could never be revalidated)
+    def save(self, url, response, entry=None):
+        if entry:
+            with self._lock:
+                self.refetched += 1
+
+        if response.status_code != 200 or not (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            return
+
+        self.store.set(self._key(url), {
+            "url": response.url,
+            "headers": {name: response.headers[name] for name in STORED_HEADERS if response.headers.get(name)},
+            "encoding": response.encoding,
+            "body": base64.b64encode(response.content).decode("ascii"),
+        })
+
+    # ♻️ Turns a 304 into the cached 200 response (same attributes callers read from a fresh one)
+    def replay(self, entry, not_modified):
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        with self._lock:
+            self.revalidated += 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = base64.b64decode(entry["body"])
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry.get("encoding")
+        response.url = entry["url"]
+        response.request = not_modified.request
+        return response
+
+    # 📊 Counters for logging
+    def stats(self):
+        with self._lock:
+            return {"revalidated": self.revalidated, "refetched": self.refetched}
+
+
+# 🗄️ Returns the process-wide HTTP cache, or None when disabled (WEBSITE_HTTP_CACHE=false)
+def get_http_cache():
+    global _cache
+
+    if not WEBSITE_HTTP_CACHE:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache(DiskCache(
+                HTTP_CACHE_DIR,
+                max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024,
+                ttl_seconds=HTTP_CACHE_TTL_DAYS * 24 * 3600,
+                name="http",
+            ))
+        return _cache
@@ -1,19 +1,13 @@
-import openai
-import json
-import os
-import re
-from dotenv import load_dotenv
+from utils.cache import get_summary_cache, make_cache_key
+from utils.structured_output import HeadingSectionsSchema, complete_structured
 
-# 🔐 Load environment variables from .env (including OpenAI key)
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_KEY")
 
+# 🤖 Model settings (also part of the summary cache key)
+MODEL = "gpt-4.1-2025-04-14"
+TEMPERATURE = 0.3
 
-# 📊 Summarizes raw website content into a structured JSON using OpenAI GPT
-def summarize_with_openai(webpage_text):
-    
-    # 📜 Construct the detailed prompt with exact format instructions
-    prompt = f"""
+# 📜 Detailed prompt with exact format instructions; {webpage_text} is filled in per request
+WEBSITE_PROMPT_TEMPLATE = """
 You are a professional business analyst. Analyze the following website content and extract comprehensive, detailed business information in JSON format.
 
 Each section should contain **4–6 bullet points** with rich, descriptive details — not short or generic phrases. Bold important keywords using `**bold**` markdown format. DO NOT include explanations, just return the valid JSON only.
@@ -61,53 +55,46 @@ Use this exact structure:
 Analyze this content:
 \"\"\"{webpage_text}\"\"\"
 """
-    # 🤖 Send request to GPT with structured prompt
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4.1-2025-04-14",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,  # Low temp for consistent, deterministic structure
-        )
 
-        # 🧾 Extract response text
-        raw_text = response["choices"][0]["message"]["content"].strip()
-        raw_text = raw_text.strip("`").strip()
+# ✅ Sections every website summary must contain, with non-empty content
+WEBSITE_SCHEMA = HeadingSectionsSchema("Website summary", (
+    "Purpose",
+    "Target Audience",
+    "About the Company",
+    "Company Information",
+    "Unique Selling Proposition (USP)",
+    "Reviews/Testimonials",
+    "Products/Service Categories",
+    "Offers",
+))
 
-        # 🔍 Remove any "json" label prefix if present
-        if raw_text.lower().startswith("json"):
-            raw_text = raw_text[4:].strip()
 
-       # 🔧 Normalize problematic characters (smart quotes, dashes, etc.)
-        raw_text = (
-            raw_text.replace("“", '"')
-            .replace("”", '"')
-            .replace("’", "'")
-            .replace("‘", "'")
-            .replace("–", "-")
-            .replace("—", "-")
-        )
+# 📊 Summarizes raw website content into a structured JSON using OpenAI GPT
+def summarize_with_openai(webpage_text):
+    
+    # ♻️ Reuse a previous summary of the exact same content, prompt and model settings
+    cache = get_summary_cache()
+    cache_key = make_cache_key("website-summary", WEBSITE_PROMPT_TEMPLATE, MODEL, TEMPERATURE, webpage_text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print("♻️ Website summary served from cache.")
+        return cached
 
-        # 🧠 Extract valid JSON block using regex
-        match = re.search(r"{.*}", raw_text, re.DOTALL)
-        json_text = match.group(0) if match else raw_text
+    # 📜 Construct the detailed prompt with exact format instructions
+    prompt = WEBSITE_PROMPT_TEMPLATE.format(webpage_text=webpage_text)
 
-        return json.loads(json_text)
+    # 🤖 Send request to GPT; malformed JSON is repaired locally and only missing or empty sections are re-asked.
+    # A reply with no usable JSON at all raises, so the row is retried instead of saving an empty document.
+    summary = complete_structured(
+        WEBSITE_SCHEMA,
+        [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt},
+        ],
+        model=MODEL,
+        temperature=TEMPERATURE,  # Low temp for consistent, deterministic structure
+    )
 
-    # ❌ Handle failures in GPT response or JSON parsing
-    except Exception as e:
-        print("⚠️ OpenAI JSON parsing failed:", e)
-        print("⚠️ Raw output was:\n", raw_text)
-        
-        # Return fallback default structure
-        return {
-            "title": "Summary Unavailable",
-            "sections": [
-                {
-                    "heading": "Error",
-                    "content": "OpenAI returned invalid or incomplete JSON.",
-                }
-            ],
-        }
\ No newline at end of file
+    # 💾 Only validated summaries are cached
+    cache.set(cache_key, summary)
+    return summary